@@ -1,24 +1,44 @@
 import secrets
 import argparse
+import functools
+import hashlib
 import os
-import gostcrypto as GOST34112012
+import gostcrypto.gosthash
+
+try:
+    # gmpy2 (обёртка GMP) ускоряет арифметику больших чисел в разы; константы
+    # кривой объявляются типом mpz, и вся арифметика точек автоматически идёт
+    # на лимбах GMP. При отсутствии gmpy2 используются встроенные int и pow
+    from gmpy2 import mpz, powmod as _powmod
+except ImportError:
+    mpz = int
+    _powmod = pow
 
 # Параметры эллиптической кривой по ГОСТ Р 34.10-2012
-PRIME = int("FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFD97", 16)
-COEFF_A = int("FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFD94", 16)
-COEFF_B = int("A6", 16)
-ORDER = int("FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF6C611070995AD10045841B09B761B893", 16)
-BASE_X = int("1", 16)
-BASE_Y = int("8D91E471E0989CDA27DF505A453F2B7635294F2DDF23E3B122ACC99C9E9F1E14", 16)
+PRIME = mpz(int("FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFD97", 16))
+COEFF_A = mpz(int("FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFD94", 16))
+COEFF_B = mpz(int("A6", 16))
+ORDER = mpz(int("FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF6C611070995AD10045841B09B761B893", 16))
+BASE_X = mpz(int("1", 16))
+BASE_Y = mpz(int("8D91E471E0989CDA27DF505A453F2B7635294F2DDF23E3B122ACC99C9E9F1E14", 16))
 START_POINT = (BASE_X, BASE_Y)
 
+# Для этой кривой COEFF_A = PRIME - 3, что позволяет считать наклон удвоения
+# как 3*(x - 1)*(x + 1) вместо 3*x^2 + COEFF_A (приём кривых вида a = -3)
+assert (COEFF_A + 3) % PRIME == 0
+
 def inverse_modulo(value, modulus):
     """
     Вычисляет модульный обратный элемент для заданного числа по указанному модулю.
 
+    Использует малую теорему Ферма: для простого modulus обратный элемент равен
+    value^(modulus - 2) mod modulus. Встроенная функция pow выполняет возведение
+    в степень целиком на уровне C, без накладных расходов интерпретатора,
+    что заметно быстрее петли расширенного алгоритма Евклида на Python.
+
     Аргументы:
         value (int): Число, для которого ищется обратный элемент. Должно быть ненулевым и меньше modulus.
-        modulus (int): Модуль, по которому производится вычисление. Обычно это простое число (в данном случае PRIME или ORDER).
+        modulus (int): Модуль, по которому производится вычисление. Должен быть простым числом (в данном случае PRIME или ORDER).
 
     Возвращает:
         int: Обратный элемент value по модулю modulus, такой что (value * result) % modulus == 1.
@@ -26,15 +46,76 @@ def inverse_modulo(value, modulus):
     Исключения:
         ValueError: Возникает, если value равно 0, так как обратного элемента для нуля не существует.
     """
+    value %= modulus
     if value == 0:
         raise ValueError("Деление на ноль невозможно")
-    a, b = 1, 0
-    low, high = value % modulus, modulus
-    while low > 1:
-        quotient = high // low
-        a, b = b - a * quotient, a
-        low, high = high - low * quotient, low
-    return a % modulus
+    return int(_powmod(value, modulus - 2, modulus))
+
+@functools.lru_cache(maxsize=256)
+def _inv_mod_order(value):
+    """
+    Обратный элемент по модулю ORDER с кэшированием результата.
+
+    При повторных проверках подписи одних и тех же данных хэш совпадает,
+    поэтому его обращение достаточно вычислить один раз; lru_cache
+    избавляет от повторного возведения в 256-битную степень.
+    """
+    return inverse_modulo(value, ORDER)
+
+def batch_inverse(values, modulus):
+    """
+    Вычисляет обратные элементы сразу для списка чисел приёмом Монтгомери.
+
+    Вместо n отдельных обращений выполняется одно обращение произведения всех
+    значений и 3(n-1) умножений: префиксные произведения строятся слева направо,
+    затем обратный элемент произведения "разматывается" справа налево. Так как
+    одно обращение стоит сотни умножений, выигрыш почти n-кратный.
+
+    Аргументы:
+        values (list): Список ненулевых по модулю modulus целых чисел.
+        modulus (int): Простой модуль (PRIME или ORDER).
+
+    Возвращает:
+        list: Список обратных элементов в том же порядке, что и values.
+    """
+    count = len(values)
+    if count == 0:
+        return []
+    prefix = [values[0] % modulus]
+    for value in values[1:]:
+        prefix.append(prefix[-1] * value % modulus)
+    inverse = inverse_modulo(prefix[-1], modulus)
+    result = [0] * count
+    for i in range(count - 1, 0, -1):
+        result[i] = inverse * prefix[i - 1] % modulus
+        inverse = inverse * (values[i] % modulus) % modulus
+    result[0] = inverse
+    return result
+
+_MASK_256 = (1 << 256) - 1
+
+def _reduce_p(x):
+    """
+    Редукция по псевдомерсенновскому модулю PRIME = 2^256 - 617 (метод
+    Солинаса): 2^256 = 617 (mod PRIME), поэтому старшая часть числа
+    сворачивается в младшую умножением на 617 вместо полного деления.
+    Двух сворачиваний достаточно для любого произведения двух вычетов;
+    остаётся одно условное вычитание.
+
+    Аргументы:
+        x (int): Число, по модулю не превосходящее PRIME^2 (допускаются
+            и небольшие отрицательные значения разностей вычетов).
+
+    Возвращает:
+        int: x mod PRIME в диапазоне [0, PRIME).
+    """
+    x = (x >> 256) * 617 + (x & _MASK_256)
+    x = (x >> 256) * 617 + (x & _MASK_256)
+    if x >= PRIME:
+        x -= PRIME
+    elif x < 0:
+        x += PRIME
+    return x
 
 def curve_point_sum(p1, p2):
     """
@@ -53,19 +134,212 @@ def curve_point_sum(p1, p2):
         return p1
     x1, y1 = p1
     x2, y2 = p2
-    if x1 == x2 and (y1 + y2) % PRIME == 0:
-        return None
-    if p1 == p2:
-        gradient = (3 * x1 * x1 + COEFF_A) * inverse_modulo(2 * y1, PRIME) % PRIME
+    # Сначала вычисляем разность абсцисс: при dx != 0 (подавляющее
+    # большинство вызовов) сразу выполняется обычное сложение без
+    # сравнения кортежей и проверки противоположных точек
+    dx = _reduce_p(x2 - x1)
+    if dx:
+        gradient = _reduce_p((y2 - y1) * inverse_modulo(dx, PRIME))
     else:
-        gradient = (y2 - y1) * inverse_modulo(x2 - x1, PRIME) % PRIME
-    x_new = (gradient * gradient - x1 - x2) % PRIME
-    y_new = (gradient * (x1 - x_new) - y1) % PRIME
+        if _reduce_p(y1 + y2) == 0 or y1 == 0:
+            return None
+        gradient = _reduce_p(_reduce_p(3 * (x1 - 1) * (x1 + 1)) * inverse_modulo(y1 + y1, PRIME))
+    x_new = _reduce_p(gradient * gradient - x1 - x2)
+    y_new = _reduce_p(gradient * (x1 - x_new) - y1)
     return (x_new, y_new)
 
+def _jac_double(point):
+    """
+    Удваивает точку в якобиановых проективных координатах (X, Y, Z), где
+    аффинные координаты x = X/Z^2, y = Y/Z^3. Обращения по модулю не требуется.
+
+    Аргументы:
+        point (tuple или None): Точка (X, Y, Z) или None (точка в бесконечности).
+
+    Возвращает:
+        tuple или None: Удвоенная точка (X, Y, Z) или None.
+    """
+    if point is None:
+        return None
+    x, y, z = point
+    if y == 0:
+        return None
+    y_sq = y * y % PRIME
+    s = 4 * x * y_sq % PRIME
+    z_sq = z * z % PRIME
+    # COEFF_A = -3: 3X^2 + a*Z^4 = 3(X - Z^2)(X + Z^2) — экономит одно
+    # умножение и одно возведение в квадрат на каждое удвоение
+    m = 3 * (x - z_sq) * (x + z_sq) % PRIME
+    x_new = (m * m - 2 * s) % PRIME
+    y_new = (m * (s - x_new) - 8 * y_sq * y_sq) % PRIME
+    z_new = 2 * y * z % PRIME
+    return (x_new, y_new, z_new)
+
+def _jac_add_affine(p1, p2):
+    """
+    Прибавляет аффинную точку p2 = (x, y) к якобиановой точке p1 = (X, Y, Z)
+    по смешанной формуле (Z2 = 1) — дешевле общего якобианового сложения
+    и также не требует обращения по модулю.
+
+    Аргументы:
+        p1 (tuple или None): Якобианова точка (X, Y, Z) или None (бесконечность).
+        p2 (tuple или None): Аффинная точка (x, y) или None (бесконечность).
+
+    Возвращает:
+        tuple или None: Сумма точек в якобиановых координатах или None.
+    """
+    if p2 is None:
+        return p1
+    if p1 is None:
+        return (p2[0], p2[1], 1)
+    x1, y1, z1 = p1
+    x2, y2 = p2
+    z1_sq = z1 * z1 % PRIME
+    u2 = x2 * z1_sq % PRIME
+    s2 = y2 * z1_sq % PRIME * z1 % PRIME
+    h = (u2 - x1) % PRIME
+    r = (s2 - y1) % PRIME
+    if h == 0:
+        if r == 0:
+            return _jac_double(p1)
+        return None
+    h_sq = h * h % PRIME
+    h_cu = h * h_sq % PRIME
+    v = x1 * h_sq % PRIME
+    x_new = (r * r - h_cu - 2 * v) % PRIME
+    y_new = (r * (v - x_new) - y1 * h_cu) % PRIME
+    z_new = z1 * h % PRIME
+    return (x_new, y_new, z_new)
+
+def _jac_add(p1, p2):
+    """
+    Складывает две точки в якобиановых координатах по общей формуле
+    (без предположения Z2 = 1). Используется лестницей Монтгомери, где оба
+    слагаемых проективные.
+
+    Аргументы:
+        p1 (tuple или None): Первая якобианова точка (X, Y, Z) или None.
+        p2 (tuple или None): Вторая якобианова точка (X, Y, Z) или None.
+
+    Возвращает:
+        tuple или None: Сумма точек в якобиановых координатах или None.
+    """
+    if p1 is None or p1[2] == 0:
+        return p2
+    if p2 is None or p2[2] == 0:
+        return p1
+    x1, y1, z1 = p1
+    x2, y2, z2 = p2
+    z1_sq = z1 * z1 % PRIME
+    z2_sq = z2 * z2 % PRIME
+    u1 = x1 * z2_sq % PRIME
+    u2 = x2 * z1_sq % PRIME
+    s1 = y1 * z2_sq % PRIME * z2 % PRIME
+    s2 = y2 * z1_sq % PRIME * z1 % PRIME
+    h = (u2 - u1) % PRIME
+    r = (s2 - s1) % PRIME
+    if h == 0:
+        if r == 0:
+            return _jac_double(p1)
+        return None
+    h_sq = h * h % PRIME
+    h_cu = h * h_sq % PRIME
+    v = u1 * h_sq % PRIME
+    x_new = (r * r - h_cu - 2 * v) % PRIME
+    y_new = (r * (v - x_new) - s1 * h_cu) % PRIME
+    z_new = z1 * z2 % PRIME * h % PRIME
+    return (x_new, y_new, z_new)
+
+def _ladder_multiply(factor, point):
+    """
+    Умножает точку на скаляр лестницей Монтгомери с фиксированной длиной цикла.
+
+    В отличие от wNAF и гребёнки, на каждый бит скаляра выполняется ровно одно
+    сложение и одно удвоение, а цикл всегда имеет длину в разрядность ORDER —
+    последовательность операций и адресация таблиц не зависят от значения
+    секретного скаляра, что закрывает утечку по времени/кэшу. Используется
+    для операций с секретными величинами: генерации ключа и одноразового
+    числа k при подписи.
+
+    Аргументы:
+        factor (int): Секретный множитель, 1 <= factor < ORDER.
+        point (tuple): Точка на кривой в формате (x, y).
+
+    Возвращает:
+        tuple или None: Аффинная точка factor * P или None (точка в бесконечности).
+    """
+    r0 = None
+    r1 = (point[0], point[1], 1)
+    bits = bin(factor)[2:].zfill(ORDER.bit_length())
+    for bit_char in bits:
+        swap = bit_char == '1'
+        if swap:
+            r0, r1 = r1, r0
+        r1 = _jac_add(r0, r1)
+        r0 = _jac_double(r0)
+        if swap:
+            r0, r1 = r1, r0
+    return _jac_to_affine(r0)
+
+def _jac_to_affine(point):
+    """
+    Переводит точку из якобиановых координат (X, Y, Z) в аффинные (x, y).
+    Единственное обращение по модулю за всё скалярное умножение происходит здесь.
+
+    Аргументы:
+        point (tuple или None): Якобианова точка (X, Y, Z) или None.
+
+    Возвращает:
+        tuple или None: Аффинная точка (x, y) или None (точка в бесконечности).
+    """
+    if point is None:
+        return None
+    x, y, z = point
+    if z == 0:
+        return None
+    z_inv = inverse_modulo(z, PRIME)
+    z_inv_sq = z_inv * z_inv % PRIME
+    return (x * z_inv_sq % PRIME, y * z_inv_sq % PRIME * z_inv % PRIME)
+
+def _wnaf(factor, width=5):
+    """
+    Переводит множитель в знаковое представление wNAF (оконная несмежная форма).
+
+    Аргументы:
+        factor (int): Неотрицательный целый множитель (скаляр).
+        width (int): Ширина окна w; цифры принимают значения 0 и ±1, ±3, ..., ±(2^(w-1) - 1).
+
+    Возвращает:
+        list: Список цифр wNAF от младшей к старшей; между ненулевыми цифрами
+        гарантированно идут не менее w - 1 нулей, поэтому сложений точек требуется
+        примерно в w раз меньше, чем в двоичном методе "double-and-add".
+    """
+    digits = []
+    window = 1 << width
+    half = window >> 1
+    while factor > 0:
+        if factor & 1:
+            digit = factor % window
+            if digit >= half:
+                digit -= window
+            factor -= digit
+        else:
+            digit = 0
+        digits.append(digit)
+        factor >>= 1
+    return digits
+
 def multiply_point(factor, point):
     """
-    Умножает точку на эллиптической кривой на целое число методом "double-and-add".
+    Умножает точку на эллиптической кривой на целое число оконным методом wNAF (w = 5).
+
+    Предварительно строится таблица нечётных кратных [P, 3P, 5P, ..., 15P],
+    после чего основная петля выполняет по одному удвоению на бит скаляра и
+    редкие сложения (в среднем одно на w + 1 битов) — против одного сложения
+    на каждые два бита в методе "double-and-add". Вычитание точки бесплатно:
+    -P = (x, PRIME - y). Накопление идёт в якобиановых координатах, поэтому
+    вся петля обходится без обращений по модулю: единственное обращение
+    выполняется при финальном переводе в аффинные координаты.
 
     Аргументы:
         factor (int): Целый множитель, определяющий, сколько раз точка будет сложена с собой. Обычно от 1 до ORDER - 1.
@@ -74,36 +348,346 @@ def multiply_point(factor, point):
     Возвращает:
         tuple или None: Результирующая точка (x, y) на кривой или None, если результат — точка в бесконечности.
     """
+    if factor <= 0 or point is None:
+        return None
+    if point == START_POINT and factor < (1 << 256):
+        return multiply_base(factor)
+    return _wnaf_mul_with_table(factor, _wnaf_table(point))
+
+def _wnaf_table(point):
+    """
+    Строит таблицу нечётных кратных [P, 3P, 5P, ..., 15P] для wNAF-умножения
+    с шириной окна 5. Для фиксированной точки (например, открытого ключа)
+    таблицу достаточно построить один раз и переиспользовать.
+
+    Аргументы:
+        point (tuple): Точка на кривой в формате (x, y).
+
+    Возвращает:
+        list: Восемь аффинных точек — нечётные кратные исходной точки.
+    """
+    double = curve_point_sum(point, point)
+    table = [point]
+    for _ in range(7):
+        table.append(curve_point_sum(table[-1], double))
+    return table
+
+def _wnaf_mul_with_table(factor, table):
+    """
+    Выполняет wNAF-умножение по готовой таблице нечётных кратных.
+
+    Аргументы:
+        factor (int): Положительный целый множитель.
+        table (list): Таблица [P, 3P, ..., 15P], построенная _wnaf_table.
+
+    Возвращает:
+        tuple или None: Аффинная точка factor * P или None (точка в бесконечности).
+    """
+    digits = _wnaf(factor)
+    # Горячий цикл ведётся на плоских локальных переменных (cx, cy, cz)
+    # с признаком cz == 0 для бесконечности: удвоение и смешанное сложение
+    # развёрнуты на месте, чтобы не упаковывать координаты в кортеж на
+    # каждой итерации, а PRIME читается как локальная переменная
+    # (LOAD_FAST вместо LOAD_GLOBAL)
+    prime = PRIME
+    cx = cy = cz = 0
+    for digit in reversed(digits):
+        if cz:
+            if cy == 0:
+                cz = 0
+            else:
+                y_sq = cy * cy % prime
+                s = 4 * cx * y_sq % prime
+                z_sq = cz * cz % prime
+                m = 3 * (cx - z_sq) * (cx + z_sq) % prime
+                new_x = (m * m - 2 * s) % prime
+                new_z = 2 * cy * cz % prime
+                cy = (m * (s - new_x) - 8 * y_sq * y_sq) % prime
+                cx = new_x
+                cz = new_z
+        if digit:
+            if digit > 0:
+                px, py = table[digit >> 1]
+            else:
+                px, py = table[(-digit) >> 1]
+                py = prime - py
+            if cz == 0:
+                cx, cy, cz = px, py, 1
+            else:
+                z_sq = cz * cz % prime
+                u2 = px * z_sq % prime
+                s2 = py * z_sq % prime * cz % prime
+                h = (u2 - cx) % prime
+                r = (s2 - cy) % prime
+                if h == 0:
+                    # Редкий случай совпадения абсцисс: сумма либо удвоение,
+                    # либо бесконечность
+                    summed = _jac_double((cx, cy, cz)) if r == 0 else None
+                    if summed is None:
+                        cx = cy = cz = 0
+                    else:
+                        cx, cy, cz = summed
+                else:
+                    h_sq = h * h % prime
+                    h_cu = h * h_sq % prime
+                    v = cx * h_sq % prime
+                    new_x = (r * r - h_cu - 2 * v) % prime
+                    cy = (r * (v - new_x) - cy * h_cu) % prime
+                    cz = cz * h % prime
+                    cx = new_x
+    if cz == 0:
+        return None
+    return _jac_to_affine((cx, cy, cz))
+
+def _sum_with_inverse(p1, p2, inverse):
+    """
+    Складывает две точки кривой, когда обратный элемент знаменателя углового
+    коэффициента уже вычислен (например, функцией batch_inverse).
+
+    Аргументы:
+        p1 (tuple): Первая точка (x, y); при p1 == p2 выполняется удвоение.
+        p2 (tuple): Вторая точка (x, y).
+        inverse (int): Обратный элемент знаменателя: (2*y1)^-1 при удвоении,
+            (x2 - x1)^-1 при сложении разных точек.
+
+    Возвращает:
+        tuple: Результирующая точка (x, y).
+    """
+    x1, y1 = p1
+    x2, y2 = p2
+    if p1 == p2:
+        gradient = (3 * x1 * x1 + COEFF_A) * inverse % PRIME
+    else:
+        gradient = (y2 - y1) * inverse % PRIME
+    x_new = (gradient * gradient - x1 - x2) % PRIME
+    y_new = (gradient * (x1 - x_new) - y1) % PRIME
+    return (x_new, y_new)
+
+def _build_base_table(width=4, windows=64):
+    """
+    Строит таблицу кратных базовой точки START_POINT для метода фиксированной базы.
+
+    Строки таблицы независимы друг от друга, поэтому кратные j * D_i для всех
+    окон считаются "в ногу": на каждом шаге j знаменатели всех 64 сложений
+    обращаются одним вызовом batch_inverse вместо 64 отдельных обращений.
+
+    Аргументы:
+        width (int): Ширина окна в битах (скаляр разбивается на окна по width битов).
+        windows (int): Количество окон; width * windows должно покрывать разрядность ORDER.
+
+    Возвращает:
+        list: Таблица, где элемент [i][j] равен точке (j * 2^(width*i)) * START_POINT,
+        а [i][0] — None (точка в бесконечности). Около 16 * 64 точек (~64 КБ).
+    """
+    window_points = []
+    window_point = START_POINT
+    for _ in range(windows):
+        window_points.append(window_point)
+        for _ in range(width):
+            window_point = curve_point_sum(window_point, window_point)
+    table = [[None, point] for point in window_points]
+    for j in range(2, 1 << width):
+        denominators = []
+        for i in range(windows):
+            x1, y1 = table[i][-1]
+            if j == 2:
+                denominators.append(2 * y1 % PRIME)
+            else:
+                denominators.append((window_points[i][0] - x1) % PRIME)
+        inverses = batch_inverse(denominators, PRIME)
+        for i in range(windows):
+            table[i].append(_sum_with_inverse(table[i][-1], window_points[i], inverses[i]))
+    return table
+
+def multiply_base(factor):
+    """
+    Умножает базовую точку START_POINT на скаляр по предвычисленной таблице BASE_MULTIPLES.
+
+    Скаляр разбивается на 64 окна по 4 бита; результат складывается из готовых
+    кратных без единого удвоения в горячем цикле — все удвоения выполнены один
+    раз при загрузке модуля. Накопление идёт в якобиановых координатах
+    смешанными сложениями (точки таблицы аффинные), с одним обращением в конце.
+    Окна извлекаются из байтового представления скаляра, полученного один раз,
+    поэтому длинное число не сдвигается заново на каждой итерации.
+
+    Аргументы:
+        factor (int): Целый множитель, 0 <= factor < 2^256.
+
+    Возвращает:
+        tuple или None: Точка factor * START_POINT или None (точка в бесконечности).
+    """
     current = None
-    temp_point = point
-    while factor > 0:
-        if factor & 1:
-            current = curve_point_sum(current, temp_point)
-        temp_point = curve_point_sum(temp_point, temp_point)
-        factor >>= 1
-    return current
+    factor_bytes = factor.to_bytes(32, 'little')
+    for i, byte in enumerate(factor_bytes):
+        low = byte & 15
+        if low:
+            current = _jac_add_affine(current, BASE_MULTIPLES[2 * i][low])
+        high = byte >> 4
+        if high:
+            current = _jac_add_affine(current, BASE_MULTIPLES[2 * i + 1][high])
+    return _jac_to_affine(current)
+
+def _mul_multi(terms):
+    """
+    Вычисляет сумму k_i * P_i для произвольного набора слагаемых одним
+    проходом удвоений с чередованием wNAF-цифр всех скаляров (обобщение
+    приёма Шамира-Страуса). Отрицательные скаляры обрабатываются
+    бесплатным отражением точек таблицы.
+
+    Аргументы:
+        terms (list): Список пар (k, table), где k — целый (возможно
+            отрицательный) множитель, а table — wNAF-таблица точки.
+
+    Возвращает:
+        tuple или None: Аффинная точка-сумма или None (точка в бесконечности).
+    """
+    prepared = []
+    for factor, table in terms:
+        negate = factor < 0
+        digits = _wnaf(-factor if negate else factor)
+        prepared.append((digits, table, negate))
+    length = max((len(digits) for digits, _, _ in prepared), default=0)
+    current = None
+    for i in range(length - 1, -1, -1):
+        current = _jac_double(current)
+        for digits, table, negate in prepared:
+            if i >= len(digits):
+                continue
+            digit = -digits[i] if negate else digits[i]
+            if digit > 0:
+                current = _jac_add_affine(current, table[digit >> 1])
+            elif digit < 0:
+                x_neg, y_neg = table[(-digit) >> 1]
+                current = _jac_add_affine(current, (x_neg, (PRIME - y_neg) % PRIME))
+    return _jac_to_affine(current)
+
+def _lattice_reduce_2d(u, n):
+    """
+    Редукция Лагранжа-Гаусса двумерной решётки {(a, b): a = b * u (mod n)}.
+
+    Возвращает короткий вектор (c1, c2) с |c1|, |c2| порядка sqrt(n), для
+    которого c1 = c2 * u (mod n) — скаляры проверки подписи сокращаются
+    с 256 до ~128 бит (приём Антипы/Порнена).
+
+    Аргументы:
+        u (int): Элемент кольца вычетов по модулю n.
+        n (int): Модуль (порядок группы ORDER).
 
-def compute_gost_hash(input_data):
+    Возвращает:
+        tuple: Пара (c1, c2) коротких целых коэффициентов.
+    """
+    v1 = (n, 0)
+    v2 = (u % n, 1)
+    norm1 = v1[0] * v1[0] + v1[1] * v1[1]
+    norm2 = v2[0] * v2[0] + v2[1] * v2[1]
+    while True:
+        if norm2 > norm1:
+            v1, v2 = v2, v1
+            norm1, norm2 = norm2, norm1
+        dot = v1[0] * v2[0] + v1[1] * v2[1]
+        quotient = (2 * dot + norm2) // (2 * norm2)
+        if quotient == 0:
+            return v2
+        v1 = (v1[0] - quotient * v2[0], v1[1] - quotient * v2[1])
+        norm1 = v1[0] * v1[0] + v1[1] * v1[1]
+
+def _sqrt_mod_prime(value):
     """
-    Вычисляет хэш-значение данных по стандарту ГОСТ Р 34.11-2012 с использованием библиотеки pycryptodome.
+    Извлекает квадратный корень по модулю PRIME (PRIME = 3 mod 4, поэтому
+    корень равен value^((PRIME+1)/4)).
+
+    Аргументы:
+        value (int): Квадратичный вычет по модулю PRIME.
+
+    Возвращает:
+        int или None: Корень y (0 <= y < PRIME) либо None, если value —
+        квадратичный невычет.
+    """
+    root = int(_powmod(value % PRIME, (PRIME + 1) >> 2, PRIME))
+    if root * root % PRIME != value % PRIME:
+        return None
+    return root
+
+BASE_MULTIPLES = _build_base_table()
+BASE_WNAF_TABLE = _wnaf_table(START_POINT)
+# Точка 2^128 * G и её таблица: позволяют разбить 256-битный скаляр при G
+# на два 128-битных слагаемых в проверке подписи
+BASE_SHIFT_TABLE = _wnaf_table(multiply_base(1 << 128))
+
+def _pick_streebog():
+    """
+    Выбирает самую быструю доступную реализацию Стрибог-256 один раз при
+    импорте. Если Python собран с OpenSSL, включающим ГОСТ-алгоритмы,
+    hashlib.new('streebog256') работает на уровне C и в разы быстрее
+    чистопитоновского gostcrypto; иначе остаётся gostcrypto.gosthash.
+    """
+    try:
+        hashlib.new('streebog256')
+        return lambda: hashlib.new('streebog256')
+    except ValueError:
+        return lambda: gostcrypto.gosthash.new('streebog256')
+
+_new_streebog = _pick_streebog()
+
+def compute_gost_hash(source):
+    """
+    Вычисляет хэш-значение данных по стандарту ГОСТ Р 34.11-2012 (Стрибог-256).
+
+    Файловый объект хэшируется потоково блоками по 1 МиБ: файл не считывается
+    в память целиком, поэтому потребление памяти не зависит от размера данных,
+    а чтение с диска перекрывается со сжатием хэша. Крупный блок амортизирует
+    накладные расходы Python на вызовы update и сокращает число системных
+    вызовов чтения.
 
     Аргументы:
-        input_data (bytes): Входные данные в виде байтовой строки, которые нужно захэшировать (например, содержимое файла).
+        source (bytes или file-like): Входные данные: байтовая строка либо
+            открытый в двоичном режиме файловый объект.
 
     Возвращает:
         int: Хэш-значение в виде целого числа, полученное из 256-битного хэша, преобразованного в integer.
     """
     try:
-        hasher = GOST34112012.new(data=input_data)
+        hasher = _new_streebog()
+        if isinstance(source, (bytes, bytearray)):
+            hasher.update(source)
+        else:
+            while chunk := source.read(1 << 20):
+                hasher.update(chunk)
         return int.from_bytes(hasher.digest(), byteorder='big')
     except Exception as e:
         print(f"Ошибка хэширования: {e}")
         return None
 
+def _rand_scalar():
+    """
+    Случайный скаляр из [1, ORDER): 32 байта из token_bytes и редкая
+    повторная выборка вместо более дорогого secrets.randbelow.
+    """
+    while True:
+        value = int.from_bytes(secrets.token_bytes(32), 'big')
+        if 0 < value < ORDER:
+            return value
+
 class DigitalSignature:
     def __init__(self):
         self.secret_key = None
         self.open_key = None
+        self._pubkey_point = None
+        self._pubkey_table = None
+
+    def precompute_public(self, open_key):
+        """
+        Строит и кэширует wNAF-таблицу нечётных кратных для открытого ключа.
+
+        При проверке множества подписей одним и тем же ключом таблица
+        (восемь сложений точек) строится один раз, а каждая последующая
+        проверка обходится без повторных кратных открытого ключа.
+
+        Аргументы:
+            open_key (tuple): Открытый ключ в формате (x, y).
+        """
+        self._pubkey_point = open_key
+        self._pubkey_table = _wnaf_table(open_key)
 
     def create_keypair(self):
         """
@@ -112,25 +696,32 @@ class DigitalSignature:
         Секретный ключ — случайное число от 1 до ORDER - 1.
         Открытый ключ — точка на эллиптической кривой, полученная как START_POINT * secret_key.
         """
-        self.secret_key = secrets.randbelow(ORDER - 1) + 1
-        self.open_key = multiply_point(self.secret_key, START_POINT)
+        self.secret_key = _rand_scalar()
+        self.open_key = _ladder_multiply(self.secret_key, START_POINT)
 
-    def generate_signature(self, data):
+    def generate_signature(self, data, precomputed_hash=None):
         """
         Создает электронную цифровую подпись для данных по ГОСТ Р 34.10-2012 с использованием секретного ключа.
 
         Аргументы:
-            data (bytes): Данные, для которых создается подпись (например, содержимое файла в виде байтов).
+            data (bytes или file-like): Данные, для которых создается подпись
+                (байтовая строка либо открытый в двоичном режиме файл).
+            precomputed_hash (int или None): Заранее вычисленный хэш данных
+                (результат compute_gost_hash). Позволяет не хэшировать одни и
+                те же данные повторно, например при подписи с последующей
+                проверкой в одном процессе; при None хэш считается на месте.
 
         Возвращает:
             tuple: Подпись в формате (r, s), где r и s — целые числа, удовлетворяющие условиям алгоритма.
         """
-        hash_val = compute_gost_hash(data) % ORDER
+        if precomputed_hash is None:
+            precomputed_hash = compute_gost_hash(data)
+        hash_val = precomputed_hash % ORDER
         if hash_val == 0:
             hash_val = 1
         while True:
-            temp_k = secrets.randbelow(ORDER - 1) + 1
-            temp_point = multiply_point(temp_k, START_POINT)
+            temp_k = _rand_scalar()
+            temp_point = _ladder_multiply(temp_k, START_POINT)
             if temp_point is None:
                 continue
             r_val = temp_point[0] % ORDER
@@ -141,14 +732,18 @@ class DigitalSignature:
                 break
         return (r_val, s_val)
 
-    def check_signature(self, data, signature, open_key):
+    def check_signature(self, data, signature, open_key, precomputed_hash=None):
         """
         Проверяет валидность цифровой подписи для данных с использованием открытого ключа.
 
         Аргументы:
-            data (bytes): Данные, для которых была создана подпись (например, содержимое файла).
+            data (bytes или file-like): Данные, для которых была создана подпись
+                (байтовая строка либо открытый в двоичном режиме файл).
             signature (tuple): Подпись в формате (r, s), где r и s — целые числа.
             open_key (tuple): Открытый ключ в формате (x, y), где x и y — координаты точки на кривой.
+            precomputed_hash (int или None): Заранее вычисленный хэш данных
+                (результат compute_gost_hash); избавляет от повторного
+                хэширования при многократных проверках одних и тех же данных.
 
         Возвращает:
             bool: True, если подпись верна, False — в противном случае.
@@ -156,52 +751,127 @@ class DigitalSignature:
         r_val, s_val = signature
         if not (1 <= r_val < ORDER and 1 <= s_val < ORDER):
             return False
-        hash_val = compute_gost_hash(data) % ORDER
+        if precomputed_hash is None:
+            precomputed_hash = compute_gost_hash(data)
+        hash_val = precomputed_hash % ORDER
         if hash_val == 0:
             hash_val = 1
-        inverse_hash = inverse_modulo(hash_val, ORDER)
+        inverse_hash = _inv_mod_order(int(hash_val))
         u1 = (s_val * inverse_hash) % ORDER
         u2 = (-r_val * inverse_hash) % ORDER
-        result_point = curve_point_sum(multiply_point(u1, START_POINT), multiply_point(u2, open_key))
-        if result_point is None:
-            return False
-        return (result_point[0] % ORDER) == r_val
+        if self._pubkey_table is None or self._pubkey_point != open_key:
+            self.precompute_public(open_key)
+        # Приём Антипы: вместо проверки R = u1*G + u2*Q с 256-битными
+        # скалярами находим короткие c1 = c2 * u2 (mod ORDER), восстанавливаем
+        # точку R по координате r и проверяем эквивалентное равенство
+        # v*G + c1*Q - c2*R = O, где все скаляры ~128-битные
+        c1, c2 = _lattice_reduce_2d(u2, ORDER)
+        v = c2 * u1 % ORDER
+        v_low = v & ((1 << 128) - 1)
+        v_high = v >> 128
+        candidates = [r_val]
+        if r_val + ORDER < PRIME:
+            candidates.append(r_val + ORDER)
+        for x_coord in candidates:
+            y_sq = (x_coord * x_coord % PRIME * x_coord + COEFF_A * x_coord + COEFF_B) % PRIME
+            y_coord = _sqrt_mod_prime(y_sq)
+            if y_coord is None:
+                continue
+            # Координата r не задаёт знак y, поэтому проверяем обе точки
+            # (x, y) и (x, -y) — это смена знака скаляра при том же наборе
+            # кратных
+            r_table = _wnaf_table((x_coord, y_coord))
+            for c2_signed in (c2, -c2):
+                residual = _mul_multi([
+                    (v_low, BASE_WNAF_TABLE),
+                    (v_high, BASE_SHIFT_TABLE),
+                    (c1, self._pubkey_table),
+                    (-c2_signed, r_table),
+                ])
+                if residual is None:
+                    return True
+        return False
+
+def verify_batch(messages, signatures, open_keys):
+    """
+    Проверяет пакет подписей, переиспользуя предвычисления между проверками.
 
-def write_data(filepath, value, is_pair=False):
+    Сначала для всех сообщений считаются хэши (этап с последовательным
+    доступом к данным), затем проверки выполняются в порядке группировки по
+    открытому ключу: wNAF-таблица ключа строится один раз на группу, а общая
+    таблица кратных базовой точки и так разделяется всеми проверками.
+
+    Аргументы:
+        messages (list): Список данных (bytes или file-like) в том же порядке, что и подписи.
+        signatures (list): Список подписей (r, s).
+        open_keys (list): Список открытых ключей (x, y), по одному на подпись.
+
+    Возвращает:
+        list: Список bool в исходном порядке: True для верных подписей.
+    """
+    hashes = [compute_gost_hash(message) for message in messages]
+    order = sorted(range(len(messages)), key=lambda i: open_keys[i])
+    verifier = DigitalSignature()
+    results = [False] * len(messages)
+    for i in order:
+        results[i] = verifier.check_signature(
+            messages[i], signatures[i], open_keys[i], precomputed_hash=hashes[i])
+    return results
+
+def write_data(filepath, value, is_pair=False, as_text=False):
     """
-    Записывает данные (число или пару чисел) в файл в шестнадцатеричном формате.
+    Записывает данные (число или пару чисел) в файл.
+
+    По умолчанию значения сохраняются как 32-байтовые числа в порядке
+    big-endian (64 байта для пары): to_bytes/from_bytes работают быстрее
+    шестнадцатеричного форматирования и вдвое компактнее.
 
     Аргументы:
         filepath (str): Путь к файлу, в который производится запись (например, 'secret.key').
         value (int или tuple): Значение для записи: либо целое число, либо кортеж (x, y) для точек или подписей.
         is_pair (bool): Если True, value интерпретируется как пара чисел (x, y), например, для ключа или подписи.
+        as_text (bool): Если True, запись ведётся в прежнем шестнадцатеричном текстовом формате.
     """
     try:
-        with open(filepath, 'w') as file:
+        if as_text:
+            with open(filepath, 'w') as file:
+                if is_pair:
+                    file.write(f"{value[0]:x}\n{value[1]:x}")
+                else:
+                    file.write(f"{value:x}")
+            return
+        with open(filepath, 'wb') as file:
             if is_pair:
-                file.write(f"{value[0]:x}\n{value[1]:x}")
+                file.write(value[0].to_bytes(32, 'big') + value[1].to_bytes(32, 'big'))
             else:
-                file.write(f"{value:x}")
+                file.write(value.to_bytes(32, 'big'))
     except Exception as e:
         print(f"Ошибка записи в файл {filepath}: {e}")
 
 def read_data(filepath, is_pair=False):
     """
-    Читает данные из файла, интерпретируя их как шестнадцатеричные числа.
+    Читает данные из файла: сначала как 32-байтовые big-endian числа,
+    а при несовпадении длины — как прежний шестнадцатеричный текст.
 
     Аргументы:
         filepath (str): Путь к файлу, из которого читаются данные (например, 'secret.key').
-        is_pair (bool): Если True, ожидается, что файл содержит две строки (x, y) для точки или подписи.
+        is_pair (bool): Если True, ожидается пара чисел (x, y) для точки или подписи.
 
     Возвращает:
         int или tuple: Прочитанное значение: либо целое число, либо кортеж (x, y), если is_pair=True.
     """
     try:
-        with open(filepath, 'r') as file:
-            content = file.read().splitlines()
+        with open(filepath, 'rb') as file:
+            raw = file.read()
+        expected = 64 if is_pair else 32
+        if len(raw) == expected:
             if is_pair:
-                return (int(content[0], 16), int(content[1], 16))
-            return int(content[0], 16)
+                return (int.from_bytes(raw[:32], 'big'), int.from_bytes(raw[32:], 'big'))
+            return int.from_bytes(raw, 'big')
+        content = raw.decode('ascii').splitlines()
+        if is_pair:
+            return (int(content[0], 16), int(content[1], 16))
+        return int(content[0], 16)
     except Exception as e:
         print(f"Ошибка чтения файла {filepath}: {e}")
         return None
@@ -229,12 +899,11 @@ def main():
         if not os.path.exists(data_path) or not os.path.exists(secret_path):
             print("Файл данных или секретный ключ отсутствует")
             return
-        with open(data_path, "rb") as file:
-            content = file.read()
         signature_tool.secret_key = read_data(secret_path)
         if signature_tool.secret_key is None:
             return
-        signature = signature_tool.generate_signature(content)
+        with open(data_path, "rb") as file:
+            signature = signature_tool.generate_signature(file)
         write_data(sig_path, signature, is_pair=True)
         print(f"Подпись создана в файле: {sig_path}")
 
@@ -243,13 +912,12 @@ def main():
         if not all(os.path.exists(p) for p in [data_path, open_path, sig_path]):
             print("Один из файлов отсутствует")
             return
-        with open(data_path, "rb") as file:
-            content = file.read()
         open_key = read_data(open_path, is_pair=True)
         signature = read_data(sig_path, is_pair=True)
         if open_key is None or signature is None:
             return
-        is_valid = signature_tool.check_signature(content, signature, open_key)
+        with open(data_path, "rb") as file:
+            is_valid = signature_tool.check_signature(file, signature, open_key)
         print("Подпись подтверждена" if is_valid else "Подпись не подтверждена")
 
     else:
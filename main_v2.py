@@ -11,20 +11,35 @@ b = 4330887654676727690576590459565093199594211179445103958731673022496370371851
 G = (2, 4018974056539037503335449422937059775635739389905545080690979365213431566280)
 q = 57896044618658097711785492504343953926634992332820282019728792003956564823193
 
+def _mod_inverse_binary(a: int, m: int) -> int:
+    """Итеративный двоичный расширенный алгоритм Евклида (Штейн, HAC 14.61) для нечётного m."""
+    u, v = a, m
+    x1, x2 = 1, 0
+    while u != 1 and v != 1:
+        if u == 0 or v == 0:
+            raise ValueError("Модульный обратный элемент не существует")
+        while u & 1 == 0:
+            u >>= 1
+            x1 = (x1 >> 1) if x1 & 1 == 0 else ((x1 + m) >> 1)
+        while v & 1 == 0:
+            v >>= 1
+            x2 = (x2 >> 1) if x2 & 1 == 0 else ((x2 + m) >> 1)
+        if u >= v:
+            u -= v
+            x1 -= x2
+        else:
+            v -= u
+            x2 -= x1
+    return x1 % m if u == 1 else x2 % m
+
 def mod_inverse(a: int, m: int) -> int:
-    """Вычисление обратного элемента по модулю."""
-    def extended_gcd(a: int, b: int) -> Tuple[int, int, int]:
-        if a == 0:
-            return b, 0, 1
-        gcd, x1, y1 = extended_gcd(b % a, a)
-        x = y1 - (b // a) * x1
-        y = x1
-        return gcd, x, y
-
-    gcd, x, _ = extended_gcd(a, m)
-    if gcd != 1:
+    """Вычисление обратного элемента: теорема Ферма для простых модулей кривой, иначе двоичный алгоритм Евклида."""
+    a %= m
+    if a == 0:
         raise ValueError("Модульный обратный элемент не существует")
-    return (x % m + m) % m
+    if m == p or m == q:
+        return pow(a, m - 2, m)
+    return _mod_inverse_binary(a, m)
 
 def point_add(P: Tuple[int, int], Q: Tuple[int, int]) -> Tuple[int, int]:
     """Сложение двух точек на эллиптической кривой."""
@@ -41,26 +56,98 @@ def point_add(P: Tuple[int, int], Q: Tuple[int, int]) -> Tuple[int, int]:
         lam = ((3 * x1 * x1 + a) * mod_inverse(2 * y1, p)) % p
     else:
         # Сложение разных точек
-        lam = ((y2 - y1) * mod_inverse(x2 - x1, p)) % p
+        lam = ((y2 - y1) * mod_inverse((x2 - x1) % p, p)) % p
     x3 = (lam * lam - x1 - x2) % p
     y3 = (lam * (x1 - x3) - y1) % p
     return (x3, y3)
 
-def point_mult(k: int, P: Tuple[int, int]) -> Tuple[int, int]:
-    """Умножение точки на скаляр."""
-    result = None
-    temp = P
-    k = k % q
+def _wnaf(k: int, width: int = 5) -> list:
+    """Знаковое оконное представление скаляра (wNAF) с цифрами 0, ±1, ±3, ..., ±(2^(w-1)-1)."""
+    digits = []
+    window = 1 << width
+    half = window >> 1
     while k > 0:
         if k & 1:
-            result = point_add(result, temp)
-        temp = point_add(temp, temp)
+            digit = k % window
+            if digit >= half:
+                digit -= window
+            k -= digit
+        else:
+            digit = 0
+        digits.append(digit)
         k >>= 1
+    return digits
+
+def point_mult(k: int, P: Tuple[int, int]) -> Tuple[int, int]:
+    """Умножение точки на скаляр оконным методом wNAF (w = 5)."""
+    k = k % q
+    if k == 0 or P is None:
+        return None
+    if P == G:
+        return point_mult_base(k)
+    digits = _wnaf(k)
+    double = point_add(P, P)
+    table = [P]
+    for _ in range(7):
+        table.append(point_add(table[-1], double))
+    result = None
+    for digit in reversed(digits):
+        result = point_add(result, result)
+        if digit > 0:
+            result = point_add(result, table[digit >> 1])
+        elif digit < 0:
+            neg = table[(-digit) >> 1]
+            result = point_add(result, (neg[0], (p - neg[1]) % p))
+    return result
+
+def _build_base_table(width: int = 4, windows: int = 64) -> list:
+    """Таблица [i][j] = (j * 2^(width*i)) * G; все удвоения G выполняются один раз при импорте."""
+    table = []
+    window_point = G
+    for _ in range(windows):
+        row = [None, window_point]
+        for _ in range(2, 1 << width):
+            row.append(point_add(row[-1], window_point))
+        table.append(row)
+        for _ in range(width):
+            window_point = point_add(window_point, window_point)
+    return table
+
+def point_mult_base(k: int) -> Tuple[int, int]:
+    """Умножение k * G по предвычисленной таблице: только сложения, без удвоений."""
+    result = None
+    for i in range(64):
+        digit = (k >> (4 * i)) & 15
+        if digit:
+            result = point_add(result, _G_TABLE[i][digit])
+    return result
+
+_G_TABLE = _build_base_table()
+
+def mul_double(k1: int, P1: Tuple[int, int], k2: int, P2: Tuple[int, int]) -> Tuple[int, int]:
+    """Приём Шамира: k1*P1 + k2*P2 за одну последовательность удвоений по таблице {O, P1, P2, P1+P2}."""
+    table = (None, P1, P2, point_add(P1, P2))
+    length = max(k1.bit_length(), k2.bit_length())
+    bits1 = bin(k1)[2:].zfill(length)
+    bits2 = bin(k2)[2:].zfill(length)
+    result = None
+    for bit1, bit2 in zip(bits1, bits2):
+        result = point_add(result, result)
+        index = (bit1 == '1') | ((bit2 == '1') << 1)
+        if index:
+            result = point_add(result, table[index])
     return result
 
+def _rand_scalar() -> int:
+    """Случайный скаляр из [1, q): 32 байта token_bytes с повторной выборкой вместо secrets.randbelow."""
+    while True:
+        value = int.from_bytes(secrets.token_bytes(32), 'big')
+        if 0 < value < q:
+            return value
+
 def generate_keypair() -> Tuple[int, Tuple[int, int]]:
     """Генерация ключевой пары: закрытый ключ d и открытый ключ Q."""
-    d = secrets.randbelow(q - 1) + 1  # Закрытый ключ
+    d = _rand_scalar()  # Закрытый ключ
     Q = point_mult(d, G)  # Открытый ключ Q = d * G
     return d, Q
 
@@ -75,7 +162,7 @@ def sign_file(file_path: str, private_key: int) -> Tuple[int, int]:
 
     # Генерация подписи (r, s)
     while True:
-        k = secrets.randbelow(q - 1) + 1  # Случайное k
+        k = _rand_scalar()  # Случайное k
         R = point_mult(k, G)
         r = R[0] % q
         if r == 0:
@@ -102,9 +189,7 @@ def verify_file(file_path: str, signature: Tuple[int, int], public_key: Tuple[in
     w = mod_inverse(s, q)
     u1 = (h * w) % q
     u2 = (r * w) % q
-    P1 = point_mult(u1, G)
-    P2 = point_mult(u2, public_key)
-    R = point_add(P1, P2)
+    R = mul_double(u1, G, u2, public_key)
     if R is None:
         return False
     return (R[0] % q) == r
@@ -1,30 +1,72 @@
 import secrets
+import collections
 import argparse
+import functools
+import hashlib
+import mmap
 import os
 from typing import Tuple
 import gostcrypto.gosthash
 
+try:
+    # gmpy2 (обёртка GMP) ускоряет арифметику больших чисел в разы: константы
+    # кривой объявляются типом mpz, и вся арифметика точек идёт на лимбах GMP,
+    # а обратный элемент считается gmpy2.invert. Без gmpy2 — встроенные int
+    from gmpy2 import mpz, invert as _gmp_invert
+except ImportError:
+    mpz = int
+    _gmp_invert = None
+
 # Параметры эллиптической кривой ГОСТ Р 34.10-2012 (id-tc26-gost-3410-12-512-paramSetA)
-p = 57896044618658097711785492504343953926634992332820282019728792003956564823193
-a = 7
-b = 43308876546767276905765904595650931995942111794451039587316730224963703718511
-G = (2, 4018974056539037503335449422937059775635739389905545080690979365213431566280)
-q = 57896044618658097711785492504343953926634992332820282019728792003956564823193
+p = mpz(57896044618658097711785492504343953926634992332820282019728792003956564823193)
+a = mpz(7)
+b = mpz(43308876546767276905765904595650931995942111794451039587316730224963703718511)
+G = (mpz(2), mpz(4018974056539037503335449422937059775635739389905545080690979365213431566280))
+q = mpz(57896044618658097711785492504343953926634992332820282019728792003956564823193)
+
+# Константы Барретта: для фиксированного модуля остаток считается умножением
+# на магическую константу и сдвигом вместо полного деления больших чисел
+_BARRETT_K = 2 * p.bit_length()
+_P_MU = (1 << _BARRETT_K) // p
+_Q_MU = (1 << _BARRETT_K) // q
+
+def mod_p(x: int) -> int:
+    """Редукция x mod p методом Барретта (корректна для |x| < p^2)."""
+    r = x - ((x * _P_MU) >> _BARRETT_K) * p
+    while r >= p:
+        r -= p
+    while r < 0:
+        r += p
+    return r
+
+def mod_q(x: int) -> int:
+    """Редукция x mod q методом Барретта (корректна для |x| < q^2)."""
+    r = x - ((x * _Q_MU) >> _BARRETT_K) * q
+    while r >= q:
+        r -= q
+    while r < 0:
+        r += q
+    return r
+
+def _reduce_to_q(x: int) -> int:
+    """Приведение 256-битного дайджеста по модулю q: q > 2^255, так что вместо деления достаточно условных вычитаний."""
+    if x >= q:
+        x -= q
+    if x >= q:
+        x -= q
+    return x if x < q else x % q
 
 def mod_inverse(a: int, m: int) -> int:
-    """Вычисление обратного элемента по модулю."""
-    def extended_gcd(a: int, b: int) -> Tuple[int, int, int]:
-        if a == 0:
-            return b, 0, 1
-        gcd, x1, y1 = extended_gcd(b % a, a)
-        x = y1 - (b // a) * x1
-        y = x1
-        return gcd, x, y
-
-    gcd, x, _ = extended_gcd(a, m)
-    if gcd != 1:
+    """Вычисление обратного элемента по модулю: gmpy2.invert, иначе встроенный pow(a, -1, m) уровня C."""
+    if _gmp_invert is not None:
+        try:
+            return int(_gmp_invert(a, m))
+        except ZeroDivisionError:
+            raise ValueError("Модульный обратный элемент не существует")
+    try:
+        return pow(a % m, -1, m)
+    except ValueError:
         raise ValueError("Модульный обратный элемент не существует")
-    return (x % m + m) % m
 
 def point_add(P: Tuple[int, int], Q: Tuple[int, int]) -> Tuple[int, int]:
     """Сложение двух точек на эллиптической кривой."""
@@ -46,54 +88,282 @@ def point_add(P: Tuple[int, int], Q: Tuple[int, int]) -> Tuple[int, int]:
         if x1 == x2:
             return None
         lam = ((y2 - y1) * mod_inverse((x2 - x1) % p, p)) % p
-    x3 = (lam * lam - x1 - x2) % p
-    y3 = (lam * (x1 - x3) - y1) % p
+    x3 = mod_p(lam * lam - x1 - x2)
+    y3 = mod_p(lam * (x1 - x3) - y1)
     return (x3, y3)
 
-def point_mult(k: int, P: Tuple[int, int]) -> Tuple[int, int]:
-    """Умножение точки на скаляр."""
-    if k == 0 or P is None:
+def jac_double(P: Tuple[int, int, int]) -> Tuple[int, int, int]:
+    """Удвоение точки в якобиановых координатах (x = X/Z^2, y = Y/Z^3) без обращения по модулю."""
+    if P is None:
         return None
-    result = None
-    temp = P
+    X, Y, Z = P
+    if Y == 0:
+        return None
+    A = mod_p(X * X)
+    B = mod_p(Y * Y)
+    C = mod_p(B * B)
+    D = mod_p(2 * ((X + B) * (X + B) - A - C))
+    Z_sq = mod_p(Z * Z)
+    E = mod_p(3 * A + mod_p(a * Z_sq) * Z_sq)
+    X3 = mod_p(E * E - 2 * D)
+    Y3 = mod_p(E * (D - X3) - 8 * C)
+    Z3 = mod_p(2 * Y * Z)
+    return (X3, Y3, Z3)
+
+def jac_add_mixed(P: Tuple[int, int, int], Q: Tuple[int, int]) -> Tuple[int, int, int]:
+    """Смешанное сложение якобиановой точки P с аффинной Q (Z2 = 1) без обращения по модулю."""
+    if Q is None:
+        return P
+    if P is None:
+        return (Q[0], Q[1], 1)
+    X1, Y1, Z1 = P
+    x2, y2 = Q
+    Z1_sq = mod_p(Z1 * Z1)
+    U2 = mod_p(x2 * Z1_sq)
+    S2 = mod_p(mod_p(y2 * Z1_sq) * Z1)
+    H = mod_p(U2 - X1)
+    R = mod_p(S2 - Y1)
+    if H == 0:
+        if R == 0:
+            return jac_double(P)
+        return None
+    H_sq = mod_p(H * H)
+    H_cu = mod_p(H * H_sq)
+    V = mod_p(X1 * H_sq)
+    X3 = mod_p(R * R - H_cu - 2 * V)
+    Y3 = mod_p(R * (V - X3) - Y1 * H_cu)
+    Z3 = mod_p(Z1 * H)
+    return (X3, Y3, Z3)
+
+def jac_to_affine(P: Tuple[int, int, int]) -> Tuple[int, int]:
+    """Перевод из якобиановых координат в аффинные: единственное обращение по модулю на всё умножение."""
+    if P is None:
+        return None
+    X, Y, Z = P
+    Z_inv = mod_inverse(Z, p)
+    Z_inv_sq = mod_p(Z_inv * Z_inv)
+    return (mod_p(X * Z_inv_sq), mod_p(mod_p(Y * Z_inv_sq) * Z_inv))
+
+def jac_add(P1: Tuple[int, int, int], P2: Tuple[int, int, int]) -> Tuple[int, int, int]:
+    """Общее сложение двух якобиановых точек (без предположения Z2 = 1)."""
+    if P1 is None:
+        return P2
+    if P2 is None:
+        return P1
+    X1, Y1, Z1 = P1
+    X2, Y2, Z2 = P2
+    Z1_sq = mod_p(Z1 * Z1)
+    Z2_sq = mod_p(Z2 * Z2)
+    U1 = mod_p(X1 * Z2_sq)
+    U2 = mod_p(X2 * Z1_sq)
+    S1 = mod_p(mod_p(Y1 * Z2_sq) * Z2)
+    S2 = mod_p(mod_p(Y2 * Z1_sq) * Z1)
+    H = mod_p(U2 - U1)
+    R = mod_p(S2 - S1)
+    if H == 0:
+        if R == 0:
+            return jac_double(P1)
+        return None
+    H_sq = mod_p(H * H)
+    H_cu = mod_p(H * H_sq)
+    V = mod_p(U1 * H_sq)
+    X3 = mod_p(R * R - H_cu - 2 * V)
+    Y3 = mod_p(R * (V - X3) - S1 * H_cu)
+    Z3 = mod_p(mod_p(Z1 * Z2) * H)
+    return (X3, Y3, Z3)
+
+def ladder_mult(k: int, P: Tuple[int, int]) -> Tuple[int, int]:
+    """Лестница Монтгомери для секретных скаляров: фиксированное число итераций, на каждой ровно одно удвоение и одно сложение."""
     k = k % q
+    if k == 0 or P is None:
+        return None
+    r0 = None
+    r1 = (P[0], P[1], 1)
+    for bit in bin(k)[2:].zfill(q.bit_length()):
+        if bit == '1':
+            r0 = jac_add(r0, r1)
+            r1 = jac_double(r1)
+        else:
+            r1 = jac_add(r0, r1)
+            r0 = jac_double(r0)
+    return jac_to_affine(r0)
+
+def naf_w(k: int, w: int = 5) -> list:
+    """Знаковое оконное представление скаляра (wNAF) с цифрами 0, ±1, ±3, ..., ±(2^(w-1)-1)."""
+    digits = []
+    window = 1 << w
+    half = window >> 1
     while k > 0:
         if k & 1:
-            result = point_add(result, temp)
-        temp = point_add(temp, temp)
+            digit = k % window
+            if digit >= half:
+                digit -= window
+            k -= digit
+        else:
+            digit = 0
+        digits.append(digit)
         k >>= 1
-    return result
+    return digits
+
+def _build_base_table(width: int = 4, windows: int = 64) -> list:
+    """Таблица [i][j] = (j * 2^(width*i)) * G метода фиксированной базы; все удвоения G выполняются один раз при импорте."""
+    table = []
+    window_point = G
+    for _ in range(windows):
+        row = [None, window_point]
+        for _ in range(2, 1 << width):
+            row.append(point_add(row[-1], window_point))
+        table.append(row)
+        for _ in range(width):
+            window_point = point_add(window_point, window_point)
+    return table
+
+def point_mult_base(k: int) -> Tuple[int, int]:
+    """Умножение k * G по предвычисленной таблице: только смешанные сложения, без удвоений."""
+    result = None
+    for i in range(64):
+        digit = (k >> (4 * i)) & 15
+        if digit:
+            result = jac_add_mixed(result, _G_TABLE[i][digit])
+    return jac_to_affine(result)
+
+def point_mult(k: int, P: Tuple[int, int]) -> Tuple[int, int]:
+    """Умножение точки на скаляр методом wNAF (w = 5) в якобиановых координатах."""
+    k = k % q
+    if k == 0 or P is None:
+        return None
+    if P == G:
+        return point_mult_base(k)
+    # Таблица нечётных кратных [P, 3P, ..., 15P]: втрое меньше сложений,
+    # чем у двоичного метода. Координаты накапливаются в плоских локальных
+    # переменных (cx, cy, cz; cz == 0 — бесконечность): без кортежа на шаг
+    double = point_add(P, P)
+    table = [P]
+    for _ in range(7):
+        table.append(point_add(table[-1], double))
+    red = mod_p
+    cx = cy = cz = 0
+    for digit in reversed(naf_w(k)):
+        if cz:
+            A = red(cx * cx)
+            B = red(cy * cy)
+            C = red(B * B)
+            D = red(2 * ((cx + B) * (cx + B) - A - C))
+            Z_sq = red(cz * cz)
+            E = red(3 * A + red(a * Z_sq) * Z_sq)
+            nx = red(E * E - 2 * D)
+            nz = red(2 * cy * cz)
+            cy = red(E * (D - nx) - 8 * C)
+            cx = nx
+            cz = nz
+        if digit:
+            if digit > 0:
+                qx, qy = table[digit >> 1]
+            else:
+                qx, qy = table[(-digit) >> 1]
+                qy = p - qy
+            if cz == 0:
+                cx, cy, cz = qx, qy, 1
+                continue
+            # Сюда попадаем только сразу после удвоения: квадрат нового Z
+            # равен 4*Y^2*Z^2 и собирается из его промежуточных значений
+            Z_sq = red(4 * B * Z_sq)
+            U2 = red(qx * Z_sq)
+            S2 = red(red(qy * Z_sq) * cz)
+            H = red(U2 - cx)
+            R = red(S2 - cy)
+            if H == 0:
+                if R == 0:
+                    doubled = jac_double((cx, cy, cz))
+                    cx, cy, cz = doubled if doubled is not None else (0, 0, 0)
+                else:
+                    cx = cy = cz = 0
+                continue
+            H_sq = red(H * H)
+            H_cu = red(H * H_sq)
+            V = red(cx * H_sq)
+            nx = red(R * R - H_cu - 2 * V)
+            ny = red(R * (V - nx) - cy * H_cu)
+            cx, cy, cz = nx, ny, red(cz * H)
+    if cz == 0:
+        return None
+    return jac_to_affine((cx, cy, cz))
+
+_G_TABLE = _build_base_table()
+
+def _pick_streebog():
+    """Выбор реализации Стрибог-256 при импорте: OpenSSL-вариант из hashlib (уровень C), иначе gostcrypto."""
+    try:
+        hashlib.new('streebog256')
+        return lambda: hashlib.new('streebog256'), True
+    except ValueError:
+        return lambda: gostcrypto.gosthash.new('streebog256'), False
+
+# Флаг _streebog_native включает mmap-путь: gostcrypto принимает только bytes
+_new_streebog, _streebog_native = _pick_streebog()
+
+@functools.lru_cache(maxsize=64)
+def _hash_file_cached(file_path: str, mtime_ns: int, size: int) -> int:
+    """Хэширование файла Стрибог-256 с кэшем по (путь, mtime, размер): изменение файла меняет ключ и вытесняет запись."""
+    hasher = _new_streebog()
+    with open(file_path, 'rb') as f:
+        if _streebog_native and size > (1 << 20):
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                hasher.update(mm)
+        else:
+            while chunk := f.read(1 << 20):
+                hasher.update(chunk)
+    return int.from_bytes(hasher.digest(), 'big')
+
+def hash_file(file_path: str) -> int:
+    """Хэширование файла Стрибог-256: повторные подпись и проверка одного файла берут дайджест из кэша."""
+    try:
+        st = os.stat(file_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Файл {file_path} не найден")
+    return _hash_file_cached(file_path, st.st_mtime_ns, st.st_size)
 
 def generate_keypair() -> Tuple[int, Tuple[int, int]]:
     """Генерация ключевой пары: закрытый ключ d и открытый ключ Q."""
     d = secrets.randbelow(q - 1) + 1  # Закрытый ключ
-    Q = point_mult(d, G)  # Открытый ключ Q = d * G
+    Q = ladder_mult(d, G)  # Открытый ключ Q = d * G
     if Q is None:
         raise ValueError("Не удалось сгенерировать открытый ключ")
     return d, Q
 
+_K_POOL = collections.deque()
+
+def _refill_k_pool(batch: int = 8) -> None:
+    """Пополнение пула кандидатов (k, k*G, k^-1): пакетное обращение Монтгомери даёт одно обращение на весь пакет."""
+    ks = [secrets.randbelow(q - 1) + 1 for _ in range(batch)]
+    points = [ladder_mult(k, G) for k in ks]
+    prefix = [ks[0]]
+    for k in ks[1:]:
+        prefix.append(mod_q(prefix[-1] * k))
+    inv_all = mod_inverse(prefix[-1], q)
+    inverses = [0] * batch
+    for i in range(batch - 1, 0, -1):
+        inverses[i] = mod_q(inv_all * prefix[i - 1])
+        inv_all = mod_q(inv_all * ks[i])
+    inverses[0] = inv_all
+    _K_POOL.extend(zip(ks, points, inverses))
+
 def sign_file(file_path: str, private_key: int) -> Tuple[int, int]:
     """Создание ЭЦП для файла с использованием ГОСТ Р 34.11-2012."""
     # Хэширование файла с помощью Стрибог-256
-    hasher = gostcrypto.gosthash.new('streebog256')
-    try:
-        with open(file_path, 'rb') as f:
-            while chunk := f.read(8192):
-                hasher.update(chunk)
-    except FileNotFoundError:
-        raise FileNotFoundError(f"Файл {file_path} не найден")
-    h = int.from_bytes(hasher.digest(), 'big') % q
+    h = _reduce_to_q(hash_file(file_path))
 
     # Генерация подписи (r, s)
     while True:
-        k = secrets.randbelow(q - 1) + 1  # Случайное k
-        R = point_mult(k, G)
+        if not _K_POOL:
+            _refill_k_pool()
+        k, R, k_inv = _K_POOL.popleft()
         if R is None:
             continue
         r = R[0] % q
         if r == 0:
             continue
-        s = (mod_inverse(k, q) * (h + private_key * r)) % q
+        s = mod_q(k_inv * mod_q(h + private_key * r))
         if s != 0:
             break
     return (r, s)
@@ -105,23 +375,16 @@ def verify_file(file_path: str, signature: Tuple[int, int], public_key: Tuple[in
         return False
 
     # Хэширование файла с помощью Стрибог-256
-    hasher = gostcrypto.gosthash.new('streebog256')
-    try:
-        with open(file_path, 'rb') as f:
-            while chunk := f.read(8192):
-                hasher.update(chunk)
-    except FileNotFoundError:
-        raise FileNotFoundError(f"Файл {file_path} не найден")
-    h = int.from_bytes(hasher.digest(), 'big') % q
+    h = _reduce_to_q(hash_file(file_path))
 
     # Проверка подписи
     try:
         w = mod_inverse(s, q)
     except ValueError:
         return False
-    u1 = (h * w) % q
-    u2 = (r * w) % q
-    P1 = point_mult(u1, G)
+    u1 = mod_q(h * w)
+    u2 = mod_q(r * w)
+    P1 = point_mult_base(u1)
     P2 = point_mult(u2, public_key)
     R = point_add(P1, P2)
     if R is None:
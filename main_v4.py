@@ -1,14 +1,88 @@
 import secrets
+import collections
+import functools
+import hashlib
+import mmap
 import os
-from typing import Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
 import gostcrypto.gosthash
 
+try:
+    # gmpy2 (обёртка GMP) ускоряет арифметику больших чисел в разы: константы
+    # кривой объявляются типом mpz, и вся арифметика точек идёт на лимбах GMP,
+    # а обратный элемент считается gmpy2.invert. Без gmpy2 — встроенные int
+    from gmpy2 import mpz, invert as _gmp_invert
+except ImportError:
+    mpz = int
+    _gmp_invert = None
+
 # Параметры эллиптической кривой ГОСТ Р 34.10-2012 (id-tc26-gost-3410-12-512-paramSetA)
-p = 57896044618658097711785492504343953926634992332820282019728792003956564823193
-a = 7
-b = 43308876546767276905765904595650931995942111794451039587316730224963703718511
-G = (2, 4018974056539037503335449422937059775635739389905545080690979365213431566280)
-q = 57896044618658097711785492504343953926634992332820282019728792003956564823193
+p = mpz(57896044618658097711785492504343953926634992332820282019728792003956564823193)
+a = mpz(7)
+b = mpz(43308876546767276905765904595650931995942111794451039587316730224963703718511)
+G = (mpz(2), mpz(4018974056539037503335449422937059775635739389905545080690979365213431566280))
+q = mpz(57896044618658097711785492504343953926634992332820282019728792003956564823193)
+
+# Константы Барретта: для фиксированного модуля остаток считается умножением
+# на магическую константу и сдвигом вместо полного деления больших чисел
+_BARRETT_K = 2 * p.bit_length()
+_P_MU = (1 << _BARRETT_K) // p
+_Q_MU = (1 << _BARRETT_K) // q
+
+def mod_p(x: int) -> int:
+    """
+    Вычисляет x mod p методом Барретта.
+
+    Параметры:
+    x (int): Число с |x| < p^2 (результат одного умножения вычетов).
+
+    Возвращает:
+    int: Остаток в диапазоне [0, p).
+    """
+    r = x - ((x * _P_MU) >> _BARRETT_K) * p
+    while r >= p:
+        r -= p
+    while r < 0:
+        r += p
+    return r
+
+def mod_q(x: int) -> int:
+    """
+    Вычисляет x mod q методом Барретта.
+
+    Параметры:
+    x (int): Число с |x| < q^2.
+
+    Возвращает:
+    int: Остаток в диапазоне [0, q).
+    """
+    r = x - ((x * _Q_MU) >> _BARRETT_K) * q
+    while r >= q:
+        r -= q
+    while r < 0:
+        r += q
+    return r
+
+def _reduce_to_q(x: int) -> int:
+    """
+    Приводит 256-битный дайджест по модулю q.
+
+    Параметры:
+    x (int): Неотрицательное число меньше 2^256.
+
+    Возвращает:
+    int: x mod q.
+
+    Примечания:
+    - Так как q > 2^255, вместо деления больших чисел достаточно одного-двух
+      условных вычитаний; остаток с делением — лишь страховочная ветка.
+    """
+    if x >= q:
+        x -= q
+    if x >= q:
+        x -= q
+    return x if x < q else x % q
 
 def mod_inverse(a: int, m: int) -> int:
     """
@@ -23,19 +97,20 @@ def mod_inverse(a: int, m: int) -> int:
     
     Генерирует исключение:
     ValueError: Если модульный обратный элемент не существует (т.е. если НОД(a, m) != 1).
-    """
-    def extended_gcd(a: int, b: int) -> Tuple[int, int, int]:
-        if a == 0:
-            return b, 0, 1
-        gcd, x1, y1 = extended_gcd(b % a, a)
-        x = y1 - (b // a) * x1
-        y = x1
-        return gcd, x, y
 
-    gcd, x, _ = extended_gcd(a, m)
-    if gcd != 1:
+    Примечания:
+    - С gmpy2 обращение выполняет gmpy2.invert; без него — встроенный
+      pow(a, -1, m), реализованный в CPython на уровне C.
+    """
+    if _gmp_invert is not None:
+        try:
+            return int(_gmp_invert(a, m))
+        except ZeroDivisionError:
+            raise ValueError("Модульный обратный элемент не существует")
+    try:
+        return pow(a % m, -1, m)
+    except ValueError:
         raise ValueError("Модульный обратный элемент не существует")
-    return (x % m + m) % m
 
 def point_add(P: Tuple[int, int], Q: Tuple[int, int]) -> Tuple[int, int]:
     """
@@ -70,36 +145,377 @@ def point_add(P: Tuple[int, int], Q: Tuple[int, int]) -> Tuple[int, int]:
         if x1 == x2:
             return None
         lam = ((y2 - y1) * mod_inverse((x2 - x1) % p, p)) % p
-    x3 = (lam * lam - x1 - x2) % p
-    y3 = (lam * (x1 - x3) - y1) % p
+    x3 = mod_p(lam * lam - x1 - x2)
+    y3 = mod_p(lam * (x1 - x3) - y1)
     return (x3, y3)
 
+def jac_double(P: Tuple[int, int, int]) -> Tuple[int, int, int]:
+    """
+    Удваивает точку в якобиановых проективных координатах (X, Y, Z).
+
+    Параметры:
+    P (Tuple[int, int, int]): Точка (X, Y, Z), где аффинные координаты x = X/Z^2, y = Y/Z^3.
+
+    Возвращает:
+    Tuple[int, int, int]: Удвоенная точка (X3, Y3, Z3) или None (точка на бесконечности).
+
+    Примечания:
+    - Формулы не требуют обращения по модулю — только умножения и сложения.
+    """
+    if P is None:
+        return None
+    X, Y, Z = P
+    if Y == 0:
+        return None
+    A = mod_p(X * X)
+    B = mod_p(Y * Y)
+    C = mod_p(B * B)
+    D = mod_p(2 * ((X + B) * (X + B) - A - C))
+    Z_sq = mod_p(Z * Z)
+    E = mod_p(3 * A + mod_p(a * Z_sq) * Z_sq)
+    X3 = mod_p(E * E - 2 * D)
+    Y3 = mod_p(E * (D - X3) - 8 * C)
+    Z3 = mod_p(2 * Y * Z)
+    return (X3, Y3, Z3)
+
+def jac_add_mixed(P: Tuple[int, int, int], Q: Tuple[int, int]) -> Tuple[int, int, int]:
+    """
+    Складывает якобианову точку P с аффинной точкой Q (смешанное сложение, Z2 = 1).
+
+    Параметры:
+    P (Tuple[int, int, int]): Якобианова точка (X, Y, Z) или None.
+    Q (Tuple[int, int]): Аффинная точка (x, y) или None.
+
+    Возвращает:
+    Tuple[int, int, int]: Сумма точек в якобиановых координатах или None.
+
+    Примечания:
+    - Обращение по модулю не выполняется; случай совпадающих абсцисс передаётся jac_double.
+    """
+    if Q is None:
+        return P
+    if P is None:
+        return (Q[0], Q[1], 1)
+    X1, Y1, Z1 = P
+    x2, y2 = Q
+    Z1_sq = mod_p(Z1 * Z1)
+    U2 = mod_p(x2 * Z1_sq)
+    S2 = mod_p(mod_p(y2 * Z1_sq) * Z1)
+    H = mod_p(U2 - X1)
+    R = mod_p(S2 - Y1)
+    if H == 0:
+        if R == 0:
+            return jac_double(P)
+        return None
+    H_sq = mod_p(H * H)
+    H_cu = mod_p(H * H_sq)
+    V = mod_p(X1 * H_sq)
+    X3 = mod_p(R * R - H_cu - 2 * V)
+    Y3 = mod_p(R * (V - X3) - Y1 * H_cu)
+    Z3 = mod_p(Z1 * H)
+    return (X3, Y3, Z3)
+
+def jac_to_affine(P: Tuple[int, int, int]) -> Tuple[int, int]:
+    """
+    Преобразует якобианову точку обратно в аффинные координаты.
+
+    Параметры:
+    P (Tuple[int, int, int]): Якобианова точка (X, Y, Z) или None.
+
+    Возвращает:
+    Tuple[int, int]: Аффинная точка (x, y) или None.
+
+    Примечания:
+    - Единственное обращение по модулю на всё скалярное умножение выполняется здесь.
+    """
+    if P is None:
+        return None
+    X, Y, Z = P
+    Z_inv = mod_inverse(Z, p)
+    Z_inv_sq = mod_p(Z_inv * Z_inv)
+    return (mod_p(X * Z_inv_sq), mod_p(mod_p(Y * Z_inv_sq) * Z_inv))
+
+def jac_add(P1: Tuple[int, int, int], P2: Tuple[int, int, int]) -> Tuple[int, int, int]:
+    """
+    Складывает две якобиановы точки по общей формуле (без предположения Z2 = 1).
+
+    Параметры:
+    P1 (Tuple[int, int, int]): Первая якобианова точка или None.
+    P2 (Tuple[int, int, int]): Вторая якобианова точка или None.
+
+    Возвращает:
+    Tuple[int, int, int]: Сумма точек в якобиановых координатах или None.
+    """
+    if P1 is None:
+        return P2
+    if P2 is None:
+        return P1
+    X1, Y1, Z1 = P1
+    X2, Y2, Z2 = P2
+    Z1_sq = mod_p(Z1 * Z1)
+    Z2_sq = mod_p(Z2 * Z2)
+    U1 = mod_p(X1 * Z2_sq)
+    U2 = mod_p(X2 * Z1_sq)
+    S1 = mod_p(mod_p(Y1 * Z2_sq) * Z2)
+    S2 = mod_p(mod_p(Y2 * Z1_sq) * Z1)
+    H = mod_p(U2 - U1)
+    R = mod_p(S2 - S1)
+    if H == 0:
+        if R == 0:
+            return jac_double(P1)
+        return None
+    H_sq = mod_p(H * H)
+    H_cu = mod_p(H * H_sq)
+    V = mod_p(U1 * H_sq)
+    X3 = mod_p(R * R - H_cu - 2 * V)
+    Y3 = mod_p(R * (V - X3) - S1 * H_cu)
+    Z3 = mod_p(mod_p(Z1 * Z2) * H)
+    return (X3, Y3, Z3)
+
+def ladder_mult(k: int, P: Tuple[int, int]) -> Tuple[int, int]:
+    """
+    Умножает точку на секретный скаляр лестницей Монтгомери.
+
+    Параметры:
+    k (int): Секретный скаляр (закрытый ключ или одноразовое k).
+    P (Tuple[int, int]): Точка на кривой.
+
+    Возвращает:
+    Tuple[int, int]: Точка k * P или None.
+
+    Примечания:
+    - Число итераций фиксировано (q.bit_length()), на каждой выполняются ровно
+      одно удвоение и одно сложение — время не зависит от битов скаляра.
+    """
+    k = k % q
+    if k == 0 or P is None:
+        return None
+    r0 = None
+    r1 = (P[0], P[1], 1)
+    for bit in bin(k)[2:].zfill(q.bit_length()):
+        if bit == '1':
+            r0 = jac_add(r0, r1)
+            r1 = jac_double(r1)
+        else:
+            r1 = jac_add(r0, r1)
+            r0 = jac_double(r0)
+    return jac_to_affine(r0)
+
+def naf_w(k: int, w: int = 5) -> list:
+    """
+    Кодирует скаляр k в знаковой оконной форме wNAF.
+
+    Параметры:
+    k (int): Неотрицательный скаляр.
+    w (int): Ширина окна; цифры принимают значения 0, ±1, ±3, ..., ±(2^(w-1)-1).
+
+    Возвращает:
+    list: Список цифр от младшей к старшей.
+    """
+    digits = []
+    window = 1 << w
+    half = window >> 1
+    while k > 0:
+        if k & 1:
+            digit = k % window
+            if digit >= half:
+                digit -= window
+            k -= digit
+        else:
+            digit = 0
+        digits.append(digit)
+        k >>= 1
+    return digits
+
+def _build_base_table(width: int = 4, windows: int = 64) -> list:
+    """
+    Строит таблицу метода фиксированной базы для точки G.
+
+    Параметры:
+    width (int): Ширина окна в битах.
+    windows (int): Количество окон (width * windows покрывает длину скаляра).
+
+    Возвращает:
+    list: Таблица, где элемент [i][j] равен (j * 2^(width*i)) * G.
+
+    Примечания:
+    - Все удвоения G выполняются один раз при импорте модуля.
+    """
+    table = []
+    window_point = G
+    for _ in range(windows):
+        row = [None, window_point]
+        for _ in range(2, 1 << width):
+            row.append(point_add(row[-1], window_point))
+        table.append(row)
+        for _ in range(width):
+            window_point = point_add(window_point, window_point)
+    return table
+
+def point_mult_base(k: int) -> Tuple[int, int]:
+    """
+    Умножает базовую точку G на скаляр k по предвычисленной таблице.
+
+    Параметры:
+    k (int): Скаляр.
+
+    Возвращает:
+    Tuple[int, int]: Точка k * G или None.
+
+    Примечания:
+    - Выполняются только смешанные сложения, удвоений нет вовсе.
+    """
+    result = None
+    for i in range(64):
+        digit = (k >> (4 * i)) & 15
+        if digit:
+            result = jac_add_mixed(result, _G_TABLE[i][digit])
+    return jac_to_affine(result)
+
 def point_mult(k: int, P: Tuple[int, int]) -> Tuple[int, int]:
     """
-    Умножает точку P на скаляр k с помощью алгоритма "удвоение и сложение".
-    
+    Умножает точку P на скаляр k оконным методом wNAF.
+
     Параметры:
     k (int): Скаляр.
     P (Tuple[int, int]): Точка на эллиптической кривой.
-    
+
     Возвращает:
     Tuple[int, int]: Результирующая точка k * P.
-    
+
     Примечания:
-    - Использует двоичный метод для эффективного вычисления.
+    - Скаляр кодируется в форме wNAF (w = 5): таблица нечётных кратных
+      [P, 3P, ..., 15P] сокращает число сложений примерно втрое.
+    - Вычисления идут в якобиановых координатах: на каждом шаге только умножения,
+      одно обращение по модулю выполняется при финальном переводе в аффинные координаты.
     - k берется по модулю q для обеспечения корректности.
+    - Координаты текущей точки накапливаются в плоских локальных переменных
+      (cx, cy, cz; cz == 0 обозначает бесконечность) — кортеж не создаётся
+      на каждом шаге цикла, редкие вырожденные случаи уходят в jac_double.
     """
+    k = k % q
     if k == 0 or P is None:
         return None
-    result = None
-    temp = P
-    k = k % q
-    while k > 0:
-        if k & 1:
-            result = point_add(result, temp)
-        temp = point_add(temp, temp)
-        k >>= 1
-    return result
+    if P == G:
+        return point_mult_base(k)
+    double = point_add(P, P)
+    table = [P]
+    for _ in range(7):
+        table.append(point_add(table[-1], double))
+    red = mod_p
+    cx = cy = cz = 0
+    for digit in reversed(naf_w(k)):
+        if cz:
+            A = red(cx * cx)
+            B = red(cy * cy)
+            C = red(B * B)
+            D = red(2 * ((cx + B) * (cx + B) - A - C))
+            Z_sq = red(cz * cz)
+            E = red(3 * A + red(a * Z_sq) * Z_sq)
+            nx = red(E * E - 2 * D)
+            nz = red(2 * cy * cz)
+            cy = red(E * (D - nx) - 8 * C)
+            cx = nx
+            cz = nz
+        if digit:
+            if digit > 0:
+                qx, qy = table[digit >> 1]
+            else:
+                qx, qy = table[(-digit) >> 1]
+                qy = p - qy
+            if cz == 0:
+                cx, cy, cz = qx, qy, 1
+                continue
+            # Эта ветка достижима только сразу после удвоения: квадрат нового
+            # Z равен 4*Y^2*Z^2 и собирается из промежуточных значений
+            # удвоения (B, Z_sq) вместо отдельного возведения в квадрат
+            Z_sq = red(4 * B * Z_sq)
+            U2 = red(qx * Z_sq)
+            S2 = red(red(qy * Z_sq) * cz)
+            H = red(U2 - cx)
+            R = red(S2 - cy)
+            if H == 0:
+                if R == 0:
+                    doubled = jac_double((cx, cy, cz))
+                    cx, cy, cz = doubled if doubled is not None else (0, 0, 0)
+                else:
+                    cx = cy = cz = 0
+                continue
+            H_sq = red(H * H)
+            H_cu = red(H * H_sq)
+            V = red(cx * H_sq)
+            nx = red(R * R - H_cu - 2 * V)
+            ny = red(R * (V - nx) - cy * H_cu)
+            cx, cy, cz = nx, ny, red(cz * H)
+    if cz == 0:
+        return None
+    return jac_to_affine((cx, cy, cz))
+
+_G_TABLE = _build_base_table()
+
+def _pick_streebog():
+    """
+    Выбирает реализацию Стрибог-256 один раз при импорте модуля.
+
+    Возвращает:
+    callable: Фабрика хэшера — OpenSSL-вариант из hashlib (работает на уровне C),
+    а при его отсутствии чистопитоновский gostcrypto.
+    """
+    try:
+        hashlib.new('streebog256')
+        return lambda: hashlib.new('streebog256'), True
+    except ValueError:
+        return lambda: gostcrypto.gosthash.new('streebog256'), False
+
+# Флаг _streebog_native включает mmap-путь: gostcrypto принимает только bytes
+_new_streebog, _streebog_native = _pick_streebog()
+
+@functools.lru_cache(maxsize=64)
+def _hash_file_cached(file_path: str, mtime_ns: int, size: int) -> int:
+    """
+    Хэширует файл алгоритмом Стрибог-256 с кэшированием результата.
+
+    Параметры:
+    file_path (str): Путь к файлу.
+    mtime_ns (int): Время изменения файла в наносекундах (часть ключа кэша).
+    size (int): Размер файла в байтах (часть ключа кэша).
+
+    Возвращает:
+    int: Хэш-значение как целое число.
+
+    Примечания:
+    - Кэш lru_cache на 64 записи: изменение файла меняет (mtime, size)
+      и вытесняет устаревший дайджест.
+    """
+    hasher = _new_streebog()
+    with open(file_path, 'rb') as f:
+        if _streebog_native and size > (1 << 20):
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                hasher.update(mm)
+        else:
+            while chunk := f.read(1 << 20):
+                hasher.update(chunk)
+    return int.from_bytes(hasher.digest(), 'big')
+
+def hash_file(file_path: str) -> int:
+    """
+    Хэширует файл алгоритмом Стрибог-256.
+
+    Параметры:
+    file_path (str): Путь к файлу.
+
+    Возвращает:
+    int: Хэш-значение как целое число.
+
+    Примечания:
+    - Повторная подпись или проверка неизменённого файла не перечитывает его:
+      дайджест возвращается из кэша по ключу (путь, mtime, размер).
+    """
+    try:
+        st = os.stat(file_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Файл {file_path} не найден")
+    return _hash_file_cached(file_path, st.st_mtime_ns, st.st_size)
 
 def generate_keypair() -> Tuple[int, Tuple[int, int]]:
     """
@@ -113,11 +529,37 @@ def generate_keypair() -> Tuple[int, Tuple[int, int]]:
     - Открытый ключ Q вычисляется как Q = d * G, где G - базовая точка.
     """
     d = secrets.randbelow(q - 1) + 1  # Закрытый ключ
-    Q = point_mult(d, G)  # Открытый ключ Q = d * G
+    Q = ladder_mult(d, G)  # Открытый ключ Q = d * G
     if Q is None:
         raise ValueError("Не удалось сгенерировать открытый ключ")
     return d, Q
 
+_K_POOL = collections.deque()
+
+def _refill_k_pool(batch: int = 8) -> None:
+    """
+    Пополняет пул кандидатов (k, k*G, k^-1 mod q) для подписи.
+
+    Параметры:
+    batch (int): Размер пакета.
+
+    Примечания:
+    - Обратные элементы всех k считаются пакетным обращением Монтгомери:
+      одно mod_inverse плюс 3*(batch-1) умножений вместо batch обращений.
+    """
+    ks = [secrets.randbelow(q - 1) + 1 for _ in range(batch)]
+    points = [ladder_mult(k, G) for k in ks]
+    prefix = [ks[0]]
+    for k in ks[1:]:
+        prefix.append(mod_q(prefix[-1] * k))
+    inv_all = mod_inverse(prefix[-1], q)
+    inverses = [0] * batch
+    for i in range(batch - 1, 0, -1):
+        inverses[i] = mod_q(inv_all * prefix[i - 1])
+        inv_all = mod_q(inv_all * ks[i])
+    inverses[0] = inv_all
+    _K_POOL.extend(zip(ks, points, inverses))
+
 def sign_file(file_path: str, private_key: int) -> Tuple[int, int]:
     """
     Создает электронную цифровую подпись (ЭЦП) для файла с использованием ГОСТ Р 34.10-2012 и ГОСТ Р 34.11-2012.
@@ -134,25 +576,19 @@ def sign_file(file_path: str, private_key: int) -> Tuple[int, int]:
     - Генерирует случайное k для каждой подписи.
     """
     # Хэширование файла с помощью Стрибог-256
-    hasher = gostcrypto.gosthash.new('streebog256')
-    try:
-        with open(file_path, 'rb') as f:
-            while chunk := f.read(8192):
-                hasher.update(chunk)
-    except FileNotFoundError:
-        raise FileNotFoundError(f"Файл {file_path} не найден")
-    h = int.from_bytes(hasher.digest(), 'big') % q
+    h = _reduce_to_q(hash_file(file_path))
 
     # Генерация подписи (r, s)
     while True:
-        k = secrets.randbelow(q - 1) + 1  # Случайное k
-        R = point_mult(k, G)
+        if not _K_POOL:
+            _refill_k_pool()
+        k, R, k_inv = _K_POOL.popleft()
         if R is None:
             continue
         r = R[0] % q
         if r == 0:
             continue
-        s = (mod_inverse(k, q) * (h + private_key * r)) % q
+        s = mod_q(k_inv * mod_q(h + private_key * r))
         if s != 0:
             break
     return (r, s)
@@ -178,29 +614,206 @@ def verify_file(file_path: str, signature: Tuple[int, int], public_key: Tuple[in
         return False
 
     # Хэширование файла с помощью Стрибог-256
-    hasher = gostcrypto.gosthash.new('streebog256')
-    try:
-        with open(file_path, 'rb') as f:
-            while chunk := f.read(8192):
-                hasher.update(chunk)
-    except FileNotFoundError:
-        raise FileNotFoundError(f"Файл {file_path} не найден")
-    h = int.from_bytes(hasher.digest(), 'big') % q
+    h = _reduce_to_q(hash_file(file_path))
 
     # Проверка подписи
     try:
         w = mod_inverse(s, q)
     except ValueError:
         return False
-    u1 = (h * w) % q
-    u2 = (r * w) % q
-    P1 = point_mult(u1, G)
+    u1 = mod_q(h * w)
+    u2 = mod_q(r * w)
+    P1 = point_mult_base(u1)
     P2 = point_mult(u2, public_key)
     R = point_add(P1, P2)
     if R is None:
         return False
     return (R[0] % q) == r
 
+def _sqrt_mod_p(value: int) -> int:
+    """
+    Извлекает квадратный корень по модулю p алгоритмом Тонелли-Шенкса.
+
+    Параметры:
+    value (int): Квадратичный вычет по модулю p.
+
+    Возвращает:
+    int: Корень y с y^2 = value (mod p) или None, если value не является вычетом.
+    """
+    value %= p
+    if value == 0:
+        return 0
+    if pow(value, (p - 1) >> 1, p) != 1:
+        return None
+    # Разложение p - 1 = m * 2^e с нечётным m
+    m = p - 1
+    e = 0
+    while m & 1 == 0:
+        m >>= 1
+        e += 1
+    # Поиск квадратичного невычета z
+    z = 2
+    while pow(z, (p - 1) >> 1, p) != p - 1:
+        z += 1
+    root = pow(value, (m + 1) >> 1, p)
+    t = pow(value, m, p)
+    c = pow(z, m, p)
+    while t != 1:
+        t_pow = t
+        order = 0
+        while t_pow != 1:
+            t_pow = t_pow * t_pow % p
+            order += 1
+        shift = pow(c, 1 << (e - order - 1), p)
+        root = root * shift % p
+        c = shift * shift % p
+        t = t * c % p
+        e = order
+    return root
+
+def recover_point(r: int) -> Tuple[int, int]:
+    """
+    Восстанавливает точку кривой по координате x = r.
+
+    Параметры:
+    r (int): Абсцисса точки (значение r из подписи).
+
+    Возвращает:
+    Tuple[int, int]: Точка (r, y) или None, если r не лежит на кривой.
+
+    Примечания:
+    - Знак y по подписи неизвестен: возвращается один из двух кандидатов,
+      поэтому вызывающая сторона должна быть готова к противоположной точке.
+    """
+    y_sq = mod_p(mod_p(r * r) * r + a * r + b)
+    y = _sqrt_mod_p(y_sq)
+    if y is None:
+        return None
+    return (r, y)
+
+# Размер порции быстрого пути: перебор знаков кодом Грея стоит до 2^N
+# сложений точек на порцию, при N = 8 это не дороже пары скалярных умножений
+_BATCH_CHUNK = 8
+
+def verify_batch(items: List[Tuple[str, Tuple[int, int], Tuple[int, int]]]) -> List[bool]:
+    """
+    Проверяет пакет подписей случайными линейными комбинациями.
+
+    Параметры:
+    items (List[Tuple]): Список кортежей (путь к файлу, подпись (r, s), открытый ключ (x, y)).
+
+    Возвращает:
+    List[bool]: Результаты проверок в исходном порядке.
+
+    Примечания:
+    - Пакет разбивается на порции по _BATCH_CHUNK подписей; каждая порция
+      проверяется одной случайной линейной комбинацией в _verify_batch_chunk.
+    """
+    results = []
+    for start in range(0, len(items), _BATCH_CHUNK):
+        results.extend(_verify_batch_chunk(items[start:start + _BATCH_CHUNK]))
+    return results
+
+def _verify_batch_chunk(items: List[Tuple[str, Tuple[int, int], Tuple[int, int]]]) -> List[bool]:
+    """
+    Проверяет порцию подписей одной случайной линейной комбинацией.
+
+    Параметры:
+    items (List[Tuple]): Не более _BATCH_CHUNK кортежей (путь, подпись, ключ).
+
+    Возвращает:
+    List[bool]: Результаты проверок в исходном порядке.
+
+    Примечания:
+    - Быстрый путь: проверка Σ c_i*u1_i*G + Σ c_i*u2_i*Q_i == Σ ±c_i*R_i со
+      случайными 128-битными c_i; слагаемые с одинаковым открытым ключом
+      объединяются заранее.
+    - Подпись не сохраняет знак y точки R_i, поэтому правая часть перебирается
+      по всем комбинациям знаков кодом Грея: соседние комбинации отличаются
+      одним слагаемым, то есть одним сложением точек вместо пересчёта суммы.
+    - Если ни одна комбинация не сошлась, каждая подпись перепроверяется
+      отдельно — так выявляются недействительные подписи.
+    """
+    recovered = []
+    for file_path, (r, s), public_key in items:
+        if not (1 <= r < q and 1 <= s < q):
+            recovered = None
+            break
+        point = recover_point(r)
+        if point is None:
+            recovered = None
+            break
+        recovered.append(point)
+    if recovered is not None:
+        base_scalar = 0
+        key_terms = {}
+        weighted = []
+        for (file_path, (r, s), public_key), point in zip(items, recovered):
+            h = _reduce_to_q(hash_file(file_path))
+            w = mod_inverse(s, q)
+            c = secrets.randbelow(1 << 128) + 1
+            base_scalar = mod_q(base_scalar + c * mod_q(h * w))
+            key = (int(public_key[0]), int(public_key[1]))
+            key_terms[key] = mod_q(key_terms.get(key, 0) + c * mod_q(r * w))
+            weighted.append(point_mult(c, point))
+        lhs = point_mult_base(base_scalar)
+        for key, scalar in key_terms.items():
+            lhs = point_add(lhs, point_mult(scalar, key))
+        rhs = None
+        for term in weighted:
+            rhs = point_add(rhs, term)
+        if lhs == rhs:
+            return [True] * len(items)
+        # Переход между комбинациями знаков: смена знака i-го слагаемого —
+        # это прибавление -2*c_i*R_i (или обратно +2*c_i*R_i)
+        steps = []
+        for term in weighted:
+            doubled = point_add(term, term)
+            negated = None if doubled is None else (doubled[0], mod_p(-doubled[1]))
+            steps.append((negated, doubled))
+        signs = [0] * len(items)
+        for code in range(1, 1 << len(items)):
+            i = (code & -code).bit_length() - 1
+            rhs = point_add(rhs, steps[i][signs[i]])
+            signs[i] ^= 1
+            if lhs == rhs:
+                return [True] * len(items)
+    # Медленный путь: поимённая проверка выявляет недействительные подписи
+    return [verify_file(file_path, signature, public_key)
+            for file_path, signature, public_key in items]
+
+def _verify_one(item: Tuple[str, Tuple[int, int], Tuple[int, int]]) -> bool:
+    """
+    Проверяет одну запись пакета (обёртка для пула процессов).
+
+    Параметры:
+    item (Tuple): Кортеж (путь к файлу, подпись (r, s), открытый ключ (x, y)).
+
+    Возвращает:
+    bool: Результат verify_file.
+    """
+    file_path, signature, public_key = item
+    return verify_file(file_path, signature, public_key)
+
+def verify_files_batch(items: List[Tuple[str, Tuple[int, int], Tuple[int, int]]]) -> List[bool]:
+    """
+    Проверяет пакет подписей параллельно по ядрам процессора.
+
+    Параметры:
+    items (List[Tuple]): Список кортежей (путь к файлу, подпись (r, s), открытый ключ (x, y)).
+
+    Возвращает:
+    List[bool]: Результаты проверок в исходном порядке.
+
+    Примечания:
+    - Проверки независимы, поэтому используются процессы (ProcessPoolExecutor):
+      потоки не дали бы выигрыша из-за GIL на арифметике больших чисел.
+    """
+    if len(items) <= 1:
+        return [_verify_one(item) for item in items]
+    with ProcessPoolExecutor() as executor:
+        return list(executor.map(_verify_one, items))
+
 def main():
     """
     Основная функция программы, реализующая интерактивный интерфейс через консоль.
@@ -1,29 +1,42 @@
-import random
+import secrets
+import functools
+import hashlib
+import mmap
+import os
 import sys
 import argparse
 from gostcrypto.gosthash import new as gost_hash
 
+try:
+    # gmpy2 (обёртка GMP) заметно ускоряет арифметику больших чисел: константы
+    # кривой хранятся как mpz, обратный элемент считает gmpy2.invert.
+    # Без gmpy2 модуль работает на встроенных int
+    from gmpy2 import mpz, invert as _gmp_invert
+except ImportError:
+    mpz = int
+    _gmp_invert = None
+
 # Параметры кривой из ГОСТ Р 34.10-2012
-p = 57896044618658097711785492504343953926418782139537452191302581570759080747169
-a = 7
-b = 43308876546767276905765900574683423135711535271985780914745867236231519206471
-xG = 2
-yG = 57896044618658097711785492504343953926418782139537452191302581570759080747168
-n = 57896044618658097711785492504343953927082934583725450622380973592137631069619
-
-def extended_gcd(a, b):
-    if a == 0:
-        return (b, 0, 1)
-    else:
-        g, y, x = extended_gcd(b % a, a)
-        return (g, x - (b // a) * y, y)
+p = mpz(57896044618658097711785492504343953926418782139537452191302581570759080747169)
+a = mpz(7)
+b = mpz(43308876546767276905765900574683423135711535271985780914745867236231519206471)
+xG = mpz(2)
+yG = mpz(57896044618658097711785492504343953926418782139537452191302581570759080747168)
+n = mpz(57896044618658097711785492504343953927082934583725450622380973592137631069619)
 
 def inverse_mod(a, m):
-    g, x, y = extended_gcd(a, m)
-    if g != 1:
+    # gmpy2.invert, когда gmpy2 установлен; иначе встроенный pow с показателем
+    # -1, считающий обратный элемент на уровне C. В обоих случаях None, если
+    # обратного элемента нет
+    if _gmp_invert is not None:
+        try:
+            return _gmp_invert(a, m)
+        except ZeroDivisionError:
+            return None
+    try:
+        return pow(a % m, -1, m)
+    except ValueError:
         return None
-    else:
-        return x % m
 
 def add_points(P, Q):
     if P is None:
@@ -33,11 +46,9 @@ def add_points(P, Q):
     x_p, y_p = P
     x_q, y_q = Q
 
-    # Приводим координаты к полю GF(p)
-    x_p = x_p % p
-    y_p = y_p % p
-    x_q = x_q % p
-    y_q = y_q % p
+    # Инвариант модуля: координаты точек уже лежат в [0, p) — приведение
+    # выполняется на входе в multiply_point, а не в каждой групповой операции
+    assert 0 <= x_p < p and 0 <= y_p < p and 0 <= x_q < p and 0 <= y_q < p
 
     if x_p == x_q and y_p != y_q:
         return None  # Вертикальная линия — результат — нейтральный элемент
@@ -59,8 +70,7 @@ def add_points(P, Q):
 
 def double_point(P):
     x, y = P
-    x = x % p
-    y = y % p
+    assert 0 <= x < p and 0 <= y < p
 
     if y == 0:
         return None  # Вертикальная линия — результат — нейтральный элемент
@@ -77,37 +87,275 @@ def double_point(P):
 
     return (x_r, y_r)
 
-def multiply_point(P, k):
+def _multiply_affine(P, k):
+    # Аффинное двоичное умножение — запасной путь на случай, когда
+    # якобианова Z необратима по модулю p: для параметров этого модуля
+    # p составное, и накопленная Z может иметь общий делитель с p
     result = None
-    addend = P
-    while k:
-        if k % 2 == 1:
+    addend = (P[0] % p, P[1] % p)
+    while k > 0:
+        if k & 1:
             result = add_points(result, addend)
+        k >>= 1
+        if k == 0 or addend is None:
+            break
         addend = double_point(addend)
-        k //= 2
     return result
 
-def hash_file(file_path):
+def jac_double(P, _p=p, _a=a):
+    # Удвоение в якобиановых координатах (x = X/Z^2, y = Y/Z^3) —
+    # только умножения, без обращения по модулю. Константы кривой привязаны
+    # аргументами по умолчанию: LOAD_FAST вместо LOAD_GLOBAL в горячем цикле
+    if P is None:
+        return None
+    X, Y, Z = P
+    if Y == 0:
+        return None
+    A = X * X % _p
+    B = Y * Y % _p
+    C = B * B % _p
+    D = 2 * ((X + B) * (X + B) - A - C) % _p
+    Z2 = Z * Z % _p
+    E = (3 * A + _a * Z2 % _p * Z2) % _p
+    X3 = (E * E - 2 * D) % _p
+    Y3 = (E * (D - X3) - 8 * C) % _p
+    Z3 = 2 * Y * Z % _p
+    return (X3, Y3, Z3)
+
+def jac_add_mixed(P, Q, _p=p):
+    # Смешанное сложение: P — якобианова точка, Q — аффинная (Z2 = 1).
+    # Модуль привязан аргументом по умолчанию — LOAD_FAST в горячем цикле
+    if Q is None:
+        return P
+    if P is None:
+        return (Q[0], Q[1], 1)
+    X1, Y1, Z1 = P
+    x2, y2 = Q
+    Z1_sq = Z1 * Z1 % _p
+    U2 = x2 * Z1_sq % _p
+    S2 = y2 * Z1_sq % _p * Z1 % _p
+    H = (U2 - X1) % _p
+    R = (S2 - Y1) % _p
+    if H == 0:
+        if R == 0:
+            return jac_double(P)
+        return None
+    H_sq = H * H % _p
+    H_cu = H * H_sq % _p
+    V = X1 * H_sq % _p
+    X3 = (R * R - H_cu - 2 * V) % _p
+    Y3 = (R * (V - X3) - Y1 * H_cu) % _p
+    Z3 = Z1 * H % _p
+    return (X3, Y3, Z3)
+
+def jac_to_affine(P):
+    # Единственное обращение по модулю на всё скалярное умножение
+    if P is None:
+        return None
+    X, Y, Z = P
+    Z_inv = inverse_mod(Z, p)
+    if Z_inv is None:
+        return None
+    Z_inv_sq = Z_inv * Z_inv % p
+    return (X * Z_inv_sq % p, Y * Z_inv_sq % p * Z_inv % p)
+
+def jac_add(P1, P2, _p=p):
+    # Общее сложение якобиановых точек (без предположения Z2 = 1) — нужно
+    # лестнице Монтгомери, где оба слагаемых проективные
+    if P1 is None:
+        return P2
+    if P2 is None:
+        return P1
+    X1, Y1, Z1 = P1
+    X2, Y2, Z2 = P2
+    Z1_sq = Z1 * Z1 % _p
+    Z2_sq = Z2 * Z2 % _p
+    U1 = X1 * Z2_sq % _p
+    U2 = X2 * Z1_sq % _p
+    S1 = Y1 * Z2_sq % _p * Z2 % _p
+    S2 = Y2 * Z1_sq % _p * Z1 % _p
+    H = (U2 - U1) % _p
+    R = (S2 - S1) % _p
+    if H == 0:
+        if R == 0:
+            return jac_double(P1)
+        return None
+    H_sq = H * H % _p
+    H_cu = H * H_sq % _p
+    V = U1 * H_sq % _p
+    X3 = (R * R - H_cu - 2 * V) % _p
+    Y3 = (R * (V - X3) - S1 * H_cu) % _p
+    Z3 = Z1 * Z2 % _p * H % _p
+    return (X3, Y3, Z3)
+
+def ladder_mult(k, P):
+    # Лестница Монтгомери для секретных скаляров: фиксированное число
+    # итераций, на каждой ровно одно удвоение и одно сложение —
+    # время не зависит от битов скаляра
+    k = k % n
+    if k == 0 or P is None:
+        return None
+    r0 = None
+    r1 = (P[0] % p, P[1] % p, 1)
+    for bit in bin(k)[2:].zfill(n.bit_length()):
+        if bit == '1':
+            r0 = jac_add(r0, r1)
+            r1 = jac_double(r1)
+        else:
+            r1 = jac_add(r0, r1)
+            r0 = jac_double(r0)
+    result = jac_to_affine(r0)
+    if result is None and r0 is not None:
+        # Z выродилась (gcd(Z, p) > 1) — досчитываем аффинно
+        return _multiply_affine(P, k)
+    return result
+
+def naf_w(k, w=5):
+    # Знаковая оконная форма wNAF: цифры 0, ±1, ±3, ..., ±15.
+    # Младшие биты извлекаются маской вместо деления по модулю
+    digits = []
+    mask = (1 << w) - 1
+    window = 1 << w
+    half = window >> 1
+    while k > 0:
+        if k & 1:
+            digit = k & mask
+            if digit >= half:
+                digit -= window
+            k -= digit
+        else:
+            digit = 0
+        digits.append(digit)
+        k >>= 1
+    return digits
+
+def _multiply_point_jac(P, k):
+    # Метод wNAF (w = 5) с накоплением в якобиановых координатах: таблица
+    # нечётных кратных [P, 3P, ..., 15P] даёт примерно втрое меньше сложений,
+    # чем двоичный метод; результат остаётся якобиановым
+    if P is None or k == 0:
+        return None
+    P = (P[0] % p, P[1] % p)
+    double = double_point(P)
+    table = [P]
+    for _ in range(7):
+        table.append(add_points(table[-1], double))
+    if any(entry is None for entry in table):
+        # Таблица нечётных кратных выродилась (gcd со знаменателем > 1) —
+        # считаем аффинно и возвращаем результат как якобианов с Z = 1
+        aff = _multiply_affine(P, k)
+        return None if aff is None else (aff[0], aff[1], 1)
+    result = None
+    for digit in reversed(naf_w(k)):
+        result = jac_double(result)
+        if digit > 0:
+            result = jac_add_mixed(result, table[digit >> 1])
+        elif digit < 0:
+            neg = table[(-digit) >> 1]
+            result = jac_add_mixed(result, (neg[0], (p - neg[1]) % p))
+    return result
+
+def _build_base_table(width=4, windows=64):
+    # Таблица [i][j] = (j * 2^(width*i)) * G для метода фиксированной базы:
+    # все удвоения базовой точки выполняются один раз при импорте модуля
+    table = []
+    window_point = (xG, yG)
+    for _ in range(windows):
+        row = [None, window_point]
+        for _ in range(2, 1 << width):
+            row.append(add_points(row[-1], window_point))
+        table.append(row)
+        for _ in range(width):
+            window_point = double_point(window_point)
+    return table
+
+def _multiply_base_jac(k):
+    # k * G по предвычисленной таблице: только смешанные сложения, без
+    # удвоений; результат остаётся якобиановым
+    k = k % n
+    if k == 0:
+        return None
+    if not _G_TABLE_OK:
+        # Таблица базовой точки содержит вырожденные записи — аффинный путь
+        aff = _multiply_affine((xG, yG), k)
+        return None if aff is None else (aff[0], aff[1], 1)
+    result = None
+    for i in range(64):
+        digit = (k >> (4 * i)) & 15
+        if digit:
+            result = jac_add_mixed(result, _G_TABLE[i][digit])
+    return result
+
+def multiply_base(k):
+    R = _multiply_base_jac(k)
+    result = jac_to_affine(R)
+    if result is None and R is not None:
+        return _multiply_affine((xG, yG), k % n)
+    return result
+
+def multiply_point(P, k):
+    if P == (xG, yG):
+        return multiply_base(k)
+    R = _multiply_point_jac(P, k)
+    result = jac_to_affine(R)
+    if result is None and R is not None:
+        return _multiply_affine(P, k)
+    return result
+
+_G_TABLE = _build_base_table()
+_G_TABLE_OK = all(entry is not None for row in _G_TABLE for entry in row[1:])
+
+def _pick_streebog():
+    # Проба OpenSSL-реализации Стрибога из hashlib (уровень C); иначе gostcrypto
+    try:
+        hashlib.new('streebog256')
+        return (lambda: hashlib.new('streebog256')), True
+    except ValueError:
+        return (lambda: gost_hash('stribog256')), False
+
+# Флаг _streebog_native включает mmap-путь: gostcrypto принимает только bytes
+_new_streebog, _streebog_native = _pick_streebog()
+
+@functools.lru_cache(maxsize=32)
+def _hash_file_cached(file_path, mtime_ns, size):
+    # Крупные файлы отображаются в память и хэшируются одним вызовом без
+    # промежуточных копий; остальные читаются блоками по 64 КиБ (кратно
+    # 64-байтовому блоку Стрибога). Ключ кэша включает mtime и размер,
+    # поэтому изменение файла вытесняет запись
+    hasher = _new_streebog()
     with open(file_path, 'rb') as f:
-        data = f.read()
-    hasher = gost_hash('stribog256')
-    hasher.update(data)
+        if _streebog_native and size > (1 << 20):
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                hasher.update(mm)
+        else:
+            while chunk := f.read(1 << 16):
+                hasher.update(chunk)
     hash_bytes = hasher.digest()
     e = int.from_bytes(hash_bytes, byteorder='big')
-    return e % n
+    # Дайджест меньше 2^256 < 2n: вместо деления достаточно одного
+    # условного вычитания
+    return e - n if e >= n else e
+
+def hash_file(file_path):
+    # Подпись и проверка одного и того же файла в одном процессе
+    # не перечитывают его с диска
+    st = os.stat(file_path)
+    return _hash_file_cached(file_path, st.st_mtime_ns, st.st_size)
 
 def generate_keys():
     while True:
-        d = random.randint(1, n-1)
-        Q = multiply_point((xG, yG), d)
+        d = secrets.randbelow(n - 1) + 1
+        Q = ladder_mult(d, (xG, yG))
         if Q is not None:
             return d, Q
 
 def sign_file(file_path, d):
     e = hash_file(file_path)
     while True:
-        k = random.randint(1, n-1)
-        R = multiply_point((xG, yG), k)
+        k = secrets.randbelow(n - 1) + 1
+        R = ladder_mult(k, (xG, yG))
+        if R is None:
+            continue
         r = R[0] % n
         if r == 0:
             continue
@@ -123,14 +371,95 @@ def verify_signature(file_path, Q, r, s):
         return False
     z1 = (s * v) % n
     z2 = (-r * v) % n
-    P1 = multiply_point((xG, yG), z1)
-    P2 = multiply_point(Q, z2)
-    P = add_points(P1, P2)
+    P = multiply_points_sum((xG, yG), z1, Q, z2)
     if P is None:
         return False
     r1 = P[0] % n
     return r1 == r
 
+def multiply_points_sum(P1, k1, P2, k2):
+    # k1*P1 + k2*P2 одной проективной суммой: слагаемые остаются якобиановыми
+    # и обращение по модулю выполняется один раз на весь результат. Общая
+    # цепочка удвоений по Шамиру здесь не выигрывает: для базовой точки
+    # работает таблица фиксированной базы, где удвоений нет вовсе
+    if P1 == (xG, yG):
+        R1 = _multiply_base_jac(k1)
+    else:
+        R1 = _multiply_point_jac(P1, k1)
+    if P2 == (xG, yG):
+        R2 = _multiply_base_jac(k2)
+    else:
+        R2 = _multiply_point_jac(P2, k2)
+    S = jac_add(R1, R2)
+    result = jac_to_affine(S)
+    if result is None and S is not None:
+        # Вырожденная Z — повторяем через аффинный запасной путь
+        return add_points(multiply_point(P1, k1), multiply_point(P2, k2))
+    return result
+
+def verify_batch(items):
+    # Пакетная проверка подписей: точки всех проверок считаются в якобиановых
+    # координатах, а их Z-координаты обращаются разом приёмом Монтгомери —
+    # одно обращение по модулю на весь пакет вместо одного на подпись
+    results = [False] * len(items)
+    pending = []
+    for idx, (file_path, Q, r, s) in enumerate(items):
+        if not (0 < r < n and 0 < s < n):
+            continue
+        e = hash_file(file_path)
+        v = inverse_mod(e, n)
+        if v is None:
+            continue
+        z1 = (s * v) % n
+        z2 = (-r * v) % n
+        R = jac_add(_multiply_base_jac(z1), _multiply_point_jac(Q, z2))
+        if R is None:
+            continue
+        pending.append((idx, R, r, Q, z1, z2))
+    if not pending:
+        return results
+    prefix = []
+    acc = 1
+    for _, (_, _, Z), _, _, _, _ in pending:
+        acc = acc * Z % p
+        prefix.append(acc)
+    inv_all = inverse_mod(acc, p)
+    if inv_all is None:
+        # Вырожденный пакет — поэлементный путь с аффинным запасным ходом
+        for idx, R, r, Q, z1, z2 in pending:
+            P = jac_to_affine(R)
+            if P is None:
+                P = add_points(multiply_base(z1), multiply_point(Q, z2))
+            results[idx] = P is not None and P[0] % n == r
+        return results
+    for i in range(len(pending) - 1, -1, -1):
+        idx, (X, _, Z), r, _, _, _ = pending[i]
+        z_inv = inv_all * prefix[i - 1] % p if i else inv_all
+        inv_all = inv_all * Z % p
+        z_inv_sq = z_inv * z_inv % p
+        results[idx] = X * z_inv_sq % p % n == r
+    return results
+
+def _read_scalar(path, legacy):
+    # Закрытый ключ: 32 байта big-endian либо десятичный текст (--legacy).
+    # Разбор десятичной строки 256-битного числа квадратичен, сырые байты
+    # читаются за один int.from_bytes
+    if legacy:
+        with open(path, 'r') as f:
+            return int(f.read())
+    with open(path, 'rb') as f:
+        return int.from_bytes(f.read(32), 'big')
+
+def _read_pair(path, legacy):
+    # Пара чисел (точка или подпись): 64 байта big-endian либо текст "a,b"
+    if legacy:
+        with open(path, 'r') as f:
+            first, second = map(int, f.read().split(','))
+        return (first, second)
+    with open(path, 'rb') as f:
+        data = f.read(64)
+    return (int.from_bytes(data[:32], 'big'), int.from_bytes(data[32:], 'big'))
+
 def main():
     parser = argparse.ArgumentParser(description='GOST Р 34.10-2012 реализация')
     subparsers = parser.add_subparsers(dest='command')
@@ -139,44 +468,72 @@ def main():
     gen_parser = subparsers.add_parser('generate', help='Сгенерировать ключи')
     gen_parser.add_argument('private_key_file', help='Файл для сохранения приватного ключа')
     gen_parser.add_argument('public_key_file', help='Файл для сохранения публичного ключа')
+    gen_parser.add_argument('--legacy', action='store_true', help='Текстовый формат файлов (как раньше)')
 
     # Подписание
     sign_parser = subparsers.add_parser('sign', help='Подписать файл')
     sign_parser.add_argument('-k', '--private-key', required=True, help='Файл с приватным ключом')
     sign_parser.add_argument('file', help='Файл для подписи')
     sign_parser.add_argument('-o', '--output', required=True, help='Файл для сохранения подписи')
+    sign_parser.add_argument('--legacy', action='store_true', help='Текстовый формат файлов (как раньше)')
 
     # Проверка
     verify_parser = subparsers.add_parser('verify', help='Проверить подпись')
     verify_parser.add_argument('-K', '--public-key', required=True, help='Файл с публичным ключом')
     verify_parser.add_argument('file', help='Файл с данными')
     verify_parser.add_argument('signature', help='Файл с подписью')
+    verify_parser.add_argument('--legacy', action='store_true', help='Текстовый формат файлов (как раньше)')
+
+    # Пакетная проверка
+    batch_parser = subparsers.add_parser('verify-batch', help='Проверить несколько подписей')
+    batch_parser.add_argument('-K', '--public-key', required=True, help='Файл с публичным ключом')
+    batch_parser.add_argument('pairs', nargs='+', help='Пары: файл подпись [файл подпись ...]')
+    batch_parser.add_argument('--legacy', action='store_true', help='Текстовый формат файлов (как раньше)')
 
     args = parser.parse_args()
 
     if args.command == 'generate':
         d, Q = generate_keys()
-        with open(args.private_key_file, 'w') as f:
-            f.write(str(d))
-        with open(args.public_key_file, 'w') as f:
-            f.write(f"{Q[0]},{Q[1]}")
+        if args.legacy:
+            with open(args.private_key_file, 'w') as f:
+                f.write(str(d))
+            with open(args.public_key_file, 'w') as f:
+                f.write(f"{Q[0]},{Q[1]}")
+        else:
+            with open(args.private_key_file, 'wb') as f:
+                f.write(int(d).to_bytes(32, 'big'))
+            with open(args.public_key_file, 'wb') as f:
+                f.write(int(Q[0]).to_bytes(32, 'big') + int(Q[1]).to_bytes(32, 'big'))
         print(f"Ключи сгенерированы: {args.private_key_file}, {args.public_key_file}")
 
     elif args.command == 'sign':
-        with open(args.private_key, 'r') as f:
-            d = int(f.read())
+        d = _read_scalar(args.private_key, args.legacy)
         r, s = sign_file(args.file, d)
-        with open(args.output, 'w') as f:
-            f.write(f"{r},{s}")
+        if args.legacy:
+            with open(args.output, 'w') as f:
+                f.write(f"{r},{s}")
+        else:
+            with open(args.output, 'wb') as f:
+                f.write(int(r).to_bytes(32, 'big') + int(s).to_bytes(32, 'big'))
         print(f"Файл подписан: {args.output}")
 
     elif args.command == 'verify':
-        with open(args.public_key, 'r') as f:
-            Q = tuple(map(int, f.read().split(',')))
-        with open(args.signature, 'r') as f:
-            r, s = map(int, f.read().split(','))
+        Q = _read_pair(args.public_key, args.legacy)
+        r, s = _read_pair(args.signature, args.legacy)
         valid = verify_signature(args.file, Q, r, s)
         print("Подпись действительна" if valid else "Подпись недействительна")
 
+    elif args.command == 'verify-batch':
+        if len(args.pairs) % 2 != 0:
+            print("Ожидаются пары: файл подпись [файл подпись ...]")
+            sys.exit(1)
+        Q = _read_pair(args.public_key, args.legacy)
+        items = []
+        for i in range(0, len(args.pairs), 2):
+            r, s = _read_pair(args.pairs[i + 1], args.legacy)
+            items.append((args.pairs[i], Q, r, s))
+        for (file_path, _, _, _), valid in zip(items, verify_batch(items)):
+            print(f"{file_path}: " + ("Подпись действительна" if valid else "Подпись недействительна"))
+
 if __name__ == '__main__':
     main()
\ No newline at end of file